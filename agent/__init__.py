@@ -1,4 +1,19 @@
-from .RAG import RAG
-from .chain import PlannerChain
-from .planner_agent import PlannerAgent
-from .planner_tool_agent import get_tool_agent
\ No newline at end of file
+import importlib
+
+# the submodules pull in langchain/langgraph and read OpenAI settings, so each is imported on first use
+_exports = {
+    'RAG': '.RAG',
+    'PlannerChain': '.chain',
+    'PlannerAgent': '.planner_agent',
+    'get_tool_agent': '.planner_tool_agent'
+}
+
+__all__ = list(_exports)
+
+
+def __getattr__(name):
+    if name not in _exports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_exports[name], __name__), name)
+    globals()[name] = value     # later lookups skip __getattr__
+    return value
@@ -9,25 +9,34 @@ from typing import override
 
 # from RAG import RAG
 from agent import RAG
+from command import validate_command
 
 
-load_dotenv()
+# OpenAI model, built on first use so importing this module needs no API key
+_model = None
 
-openai_deployment = os.getenv("OPENAI_DEPLOYMENT", "gpt-4")
-openai_api_key = os.getenv("OPENAI_API_KEY")
 
-if not openai_api_key:
-    raise ValueError("Missing OPENAI_API_KEY in environment variables")
+def get_model():
+    global _model
+    if _model is None:
+        load_dotenv()
 
-# Initialize OpenAI model
-model = ChatOpenAI(
-    model=openai_deployment,
-    openai_api_key=openai_api_key,
-    temperature=0.2,
-    max_tokens=500,
-    timeout=30,
-    max_retries=3
-)
+        openai_deployment = os.getenv("OPENAI_DEPLOYMENT", "gpt-4")
+        openai_api_key = os.getenv("OPENAI_API_KEY")
+
+        if not openai_api_key:
+            raise ValueError("Missing OPENAI_API_KEY in environment variables")
+
+        # Initialize OpenAI model
+        _model = ChatOpenAI(
+            model=openai_deployment,
+            openai_api_key=openai_api_key,
+            temperature=0.2,
+            max_tokens=500,
+            timeout=30,
+            max_retries=3
+        )
+    return _model
 
 # Define output parser
 output_parser = StrOutputParser()
@@ -68,6 +77,7 @@ class Chain(ABC):
 class PlannerChain(Chain):
     def __init__(self):
         super().__init__()
+        model = get_model()
 
         interface_prompt = """
         You are a interface agent.
@@ -243,9 +253,12 @@ class PlannerChain(Chain):
             command_guideline = self.rag.search(interpreter_response)
             core_agent_response = self.core_response(interpreter_response, command_guideline)
 
-            # success to create the command
+            # success to create the command, checked against the command specs locally
             if core_agent_response.startswith("/"):
-                return core_agent_response
+                validation_error = validate_command(core_agent_response)
+                if validation_error is None:
+                    return core_agent_response
+                core_agent_response = f"The command {core_agent_response} is invalid: {validation_error}"
             
             # fail to create the command
             chat_history.add_ai_message(f"core agent: {core_agent_response}")
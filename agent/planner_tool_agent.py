@@ -1,4 +1,4 @@
-from typing import Literal, Annotated, List
+from typing import Literal, Annotated, List, Optional
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, RemoveMessage, HumanMessage
 from langgraph.checkpoint.memory import MemorySaver
@@ -34,10 +34,11 @@ def get_tool_agent(planner, task_cls):
 
     # planner 도구
     class ShowTasksSchema(BaseModel):
-        pass
+        limit: Optional[int] = Field(None, description="The maximum number of tasks to show, all if omitted")
+        offset: int = Field(0, description="The number of tasks to skip, for the next page")
 
-    def show_tasks():
-        return planner.show_tasks()
+    def show_tasks(limit=None, offset=0):
+        return planner.show_tasks(limit=limit, offset=offset)
 
     class ShowTasksAfterNowSchema(BaseModel):
         pass
@@ -45,6 +46,32 @@ def get_tool_agent(planner, task_cls):
     def show_tasks_after_now():
         return planner.show_tasks_after_now()
 
+    class ShowTasksBetweenSchema(BaseModel):
+        start_date: str = Field(..., description="The start of the period, format: 'YYYY-MM-DD HH:MM'")
+        end_date: str = Field(..., description="The end of the period, format: 'YYYY-MM-DD HH:MM'")
+
+    def show_tasks_between(start_date, end_date):
+        try:
+            start_dt = datetime.strptime(start_date, '%Y-%m-%d %H:%M').astimezone()
+            end_dt = datetime.strptime(end_date, '%Y-%m-%d %H:%M').astimezone()
+        except ValueError as e:
+            raise ValueError(f"Invalid date format: {e}")
+        return planner.show_tasks_between(start_dt, end_dt)
+
+    class FindTasksByNameSchema(BaseModel):
+        name: str = Field(..., description="The exact name of the task")
+
+    def find_tasks_by_name(name):
+        task_list = planner.get_tasks_by_name(name)
+        return "\n".join(str(task) for task in task_list) if task_list else "No tasks found with this name."
+
+    class FindTasksByGroupSchema(BaseModel):
+        group: str = Field(..., description="Task group, e.g., '일상', '이벤트'")
+
+    def find_tasks_by_group(group):
+        task_list = planner.get_tasks_by_group(group)
+        return "\n".join(str(task) for task in task_list) if task_list else "No tasks found in this group."
+
     class CreateTaskSchema(BaseModel):
         name: str = Field(..., description="Task name")
         start_date: str = Field(..., description="""The start datetime of the task, format: 'YYYY-MM-DD HH:MM'""")
@@ -185,7 +212,7 @@ def get_tool_agent(planner, task_cls):
         StructuredTool.from_function(
             func=show_tasks,
             name="ShowTasks",
-            description="Show all the tasks.",
+            description="Show all the tasks, or one page of them with limit and offset.",
             args_schema=ShowTasksSchema
         ),
         
@@ -195,6 +222,24 @@ def get_tool_agent(planner, task_cls):
             description="Show tasks that are scheduled after the current time.",
             args_schema=ShowTasksAfterNowSchema
         ),
+        StructuredTool.from_function(
+            func=show_tasks_between,
+            name="ShowTasksBetween",
+            description="Show tasks that start within the given period.",
+            args_schema=ShowTasksBetweenSchema
+        ),
+        StructuredTool.from_function(
+            func=find_tasks_by_name,
+            name="FindTasksByName",
+            description="Find the tasks with the given name, e.g. to get their task IDs.",
+            args_schema=FindTasksByNameSchema
+        ),
+        StructuredTool.from_function(
+            func=find_tasks_by_group,
+            name="FindTasksByGroup",
+            description="Find the tasks in the given group.",
+            args_schema=FindTasksByGroupSchema
+        ),
         StructuredTool.from_function(
             func=create_task,
             name="CreateTask",
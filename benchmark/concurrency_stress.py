@@ -0,0 +1,102 @@
+# Runs many concurrent sessions against one planner and checks that no reader ever sees a torn task store.
+# usage: python benchmark/concurrency_stress.py [number_of_sessions] [operations_per_session]
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('NOTION_CACHE_DIR', '')
+
+from notion import Planner, Task, notion_api
+from notion.local_server import LocalNotionServer
+
+
+groups = ['일상', '이벤트', '업무']
+
+
+def check_store(store):
+    # every index agrees with the tasks of the same snapshot
+    tasks = store._tasks
+    assert sum(len(task_ids) for task_ids in store._by_name.values()) == len(tasks)
+    assert sum(len(task_ids) for task_ids in store._by_group.values()) == len(tasks)
+    for name, task_ids in store._by_name.items():
+        assert all(tasks[task_id].name == name for task_id in task_ids)
+    for group, task_ids in store._by_group.items():
+        assert all(tasks[task_id].group == group for task_id in task_ids)
+    assert store._by_start == sorted(store._by_start)
+    assert all(tasks[task_id].start_timestamp == start for start, task_id in store._by_start)
+    assert len(store._by_start) == sum(1 for task in tasks.values() if task.start_timestamp is not None)
+    assert len(store.render(store).splitlines()) == len(tasks)
+
+
+def session(planner, number, operations, errors, counts):
+    rng = random.Random(number)
+    own_ids = []
+    reads, writes = 0, 0
+    try:
+        for i in range(operations):
+            op = rng.random()
+            if op < 0.5:
+                check_store(planner.store)
+                planner.show_tasks(limit=20, group=rng.choice(groups))
+                reads += 1
+            elif op < 0.7 or not own_ids:
+                task = Task(None, f'session {number} task {i}', f'2030-01-{rng.randint(1, 28):02d} 09:00', rng.choice(groups))
+                planner.add_task(task)
+                own_ids.append(task.task_id)
+                writes += 1
+            elif op < 0.85:
+                task_id = rng.choice(own_ids)
+                planner.edit_task(task_id, Task(task_id, f'session {number} edited {i}', f'2030-02-{rng.randint(1, 28):02d} 09:00', rng.choice(groups)))
+                writes += 1
+            else:
+                planner.delete_task(own_ids.pop(rng.randrange(len(own_ids))))
+                writes += 1
+    except Exception as e:
+        errors.append(f"session {number}: {e!r}")
+    counts.append((reads, writes))
+
+
+def main():
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    operations = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    server = LocalNotionServer(latency=0.005).start()
+    for i in range(500):
+        server.add_page(f'seed {i}', f'2025-01-{i % 28 + 1:02d}T09:00:00.000+09:00', None, groups[i % len(groups)])
+    notion_api.configure(api_key='stress', database_id=server.database_id, base_url=server.url,
+                         rate_limit=1000, pool_size=sessions)
+
+    planner = Planner()
+    planner.wait_until_ready()
+
+    errors, counts = [], []
+    threads = [threading.Thread(target=session, args=(planner, number, operations, errors, counts))
+               for number in range(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    check_store(planner.store)
+    remote_ids = {page['id'] for page in server.pages.values() if not page.get('archived')}
+    local_ids = {task.task_id for task in planner.task_list}
+    reads, writes = sum(count[0] for count in counts), sum(count[1] for count in counts)
+    print(f"{sessions} sessions, {reads} reads and {writes} writes in {elapsed:.2f}s")
+    print(f"local tasks: {len(local_ids)}, remote pages: {len(remote_ids)}, in sync: {local_ids == remote_ids}")
+    print(f"errors: {len(errors)}")
+    for error in errors[:10]:
+        print(error)
+    server.stop()
+
+    if errors or local_ids != remote_ids:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
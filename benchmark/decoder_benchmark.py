@@ -0,0 +1,78 @@
+# Compares the schema-compiled PageDecoder with the original per-item decoding loop, both with parsed dates.
+# usage: python benchmark/decoder_benchmark.py [number_of_pages]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('NOTION_API_KEY', 'benchmark')
+
+from notion import Task
+from notion.page_decoder import PageDecoder
+
+
+def make_pages(count):
+    pages = []
+    for i in range(count):
+        pages.append({
+            'id': f'page-{i}',
+            'properties': {
+                '이름': {'id': 'title', 'type': 'title', 'title': [{'plain_text': f'task {i}'}]},
+                '날짜': {'id': 'dAtE', 'type': 'date', 'date': {'start': '2025-03-22T10:36:00.000+09:00', 'end': None}},
+                '그룹': {'id': 'gRoP', 'type': 'select', 'select': {'name': '일상'} if i % 3 else None},
+            }
+        })
+    return pages
+
+
+# the loop notion_api used before the decoder existed
+def legacy_decode(results):
+    tasks = []
+    for item in results:
+        properties = item['properties']
+        task_id = item['id']
+        name = properties['이름']['title'][0]['plain_text'] if properties['이름']['title'] else ''
+        start_date = properties.get('날짜', {}).get('date', {}).get('start', '')
+        end_date = properties.get('날짜', {}).get('date', {}).get('end', '')
+        date = {'start': start_date, 'end': end_date}
+        group = properties.get('그룹', {}).get('select', {}).get('name', '') if properties.get('그룹', {}).get('select') else ''
+        tasks.append(Task(task_id, name, date, group))
+    return tasks
+
+
+# the Task constructor parses the dates to timestamps at once, the decoder on first use,
+# so the timestamps are read here to compare the same work
+def decode_parsed(decoder, pages):
+    tasks = decoder.decode_pages(pages)
+    for task in tasks:
+        task.start_timestamp, task.end_timestamp
+    return tasks
+
+
+def best_of(func, arg, repeat=5):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    pages = make_pages(count)
+    decoder = PageDecoder.from_names()
+
+    assert [str(t) for t in legacy_decode(pages)] == [str(t) for t in decoder.decode_pages(pages)]
+
+    legacy = best_of(legacy_decode, pages)
+    compiled = best_of(lambda pages: decode_parsed(decoder, pages), pages)
+    lazy = best_of(decoder.decode_pages, pages)
+    print(f"pages:   {count}")
+    print(f"legacy:  {legacy * 1000:.1f} ms")
+    print(f"decoder: {compiled * 1000:.1f} ms ({legacy / compiled:.2f}x)")
+    print(f"decoder, dates not read yet: {lazy * 1000:.1f} ms ({legacy / lazy:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
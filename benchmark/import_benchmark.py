@@ -0,0 +1,61 @@
+# Measures the import time of the entry points with `python -X importtime` and checks it against a budget.
+# usage: python benchmark/import_benchmark.py [budget_ms]
+import os
+import subprocess
+import sys
+import time
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# module imported by each entry point, and packages it must not import
+entry_points = [
+    ('main.py (console)', 'command.Console', ('langchain', 'langgraph', 'langchain_openai', 'streamlit', 'asyncio')),
+    ('notion', 'notion', ('langchain', 'langgraph', 'asyncio')),
+    ('agent (package only)', 'agent', ('langchain', 'langgraph', 'langchain_openai')),
+]
+
+
+def import_times(module):
+    # {module: (self_us, cumulative_us)} of everything `import module` loads
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=root, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def main():
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    over_budget = False
+    for label, module, forbidden in entry_points:
+        times = import_times(module)
+        total_ms = times[module][1] / 1000
+        loaded = [name for name in forbidden if name in times]
+        slowest = sorted(times.items(), key=lambda item: item[1][0], reverse=True)[:5]
+
+        status = 'ok' if total_ms <= budget_ms and not loaded else 'FAIL'
+        over_budget |= status == 'FAIL'
+        print(f"{label:<22} {total_ms:7.1f}ms  [{status}]")
+        if loaded:
+            print(f"    imports {', '.join(loaded)}")
+        print("    slowest: " + ", ".join(f"{name} {self_us / 1000:.1f}ms" for name, (self_us, _) in slowest))
+
+    # the whole interpreter start, up to parsing the arguments
+    start = time.perf_counter()
+    subprocess.run([sys.executable, 'main.py', '--help'], cwd=root, capture_output=True, check=True)
+    print(f"{'python main.py --help':<22} {(time.perf_counter() - start) * 1000:7.1f}ms")
+
+    if over_budget:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
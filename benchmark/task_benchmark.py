@@ -0,0 +1,91 @@
+# Compares memory and decode time of the slotted, lazily parsed Task with the original dict-based Task.
+# usage: python benchmark/task_benchmark.py [number_of_tasks]
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notion import Task
+
+
+# the Task class before __slots__ and lazy parsing
+class LegacyTask:
+    def __init__(self, task_id, name, date, group):
+        self.task_id = task_id
+        self.name = name
+
+        if isinstance(date, str):
+            date = {
+                'start': date,
+                'end': None
+            }
+
+        date['start'] = None if date['start'] == "None" else date['start']
+        date['end'] = None if date['end'] == "None" else date['end']
+
+        self.date = {
+            'start': date.get('start', None) if isinstance(date.get('start'), datetime) else datetime.fromisoformat(date.get('start')) if date.get('start') else None,
+            'end': date.get('end', None) if isinstance(date.get('end'), datetime) else datetime.fromisoformat(date.get('end')) if date.get('end') else None
+        }
+
+        if self.date['start']:
+            self.date['start'] = self.date['start'].astimezone()
+        if self.date['end']:
+            self.date['end'] = self.date['end'].astimezone()
+
+        self.group = group
+        self.description = None
+
+    def __str__(self):
+        date_string = f"{self.date['start'].strftime('%Y-%m-%d %H:%M')}" if self.date['start'] else ''
+        if self.date['end']:
+            date_string += f" ~ {self.date['end'].strftime('%Y-%m-%d %H:%M')}"
+        group_string = f"{self.group}" if self.group else ''
+        return f"[{self.task_id}][{self.name}][{date_string}][{group_string}]"
+
+
+def make_rows(count):
+    return [(f'page-{i}', f'task {i}', f'2025-03-{i % 28 + 1:02d}T10:36:00.000+09:00',
+             f'2025-03-{i % 28 + 1:02d}T11:00:00.000+09:00' if i % 2 else None, '일상')
+            for i in range(count)]
+
+
+def legacy_decode(rows):
+    return [LegacyTask(task_id, name, {'start': start, 'end': end}, group) for task_id, name, start, end, group in rows]
+
+
+def slotted_decode(rows):
+    return [Task.from_iso(task_id, name, start, end, group) for task_id, name, start, end, group in rows]
+
+
+def measure(decode, rows):
+    start = time.perf_counter()
+    decode(rows)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    tasks = decode(rows)
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tasks, elapsed, memory
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rows = make_rows(count)
+
+    legacy_tasks, legacy_time, legacy_memory = measure(legacy_decode, rows)
+    tasks, slotted_time, slotted_memory = measure(slotted_decode, rows)
+
+    assert [str(t) for t in legacy_tasks[:1000]] == [str(t) for t in tasks[:1000]]
+
+    print(f"tasks:   {count}")
+    print(f"legacy:  {legacy_time * 1000:7.1f} ms  {legacy_memory / 2**20:6.1f} MiB")
+    print(f"slotted: {slotted_time * 1000:7.1f} ms  {slotted_memory / 2**20:6.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# Measures planner throughput against the local Notion stand-in server, without the network.
+# usage: python benchmark/throughput_benchmark.py [number_of_tasks]
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from notion import Planner, Task, notion_api
+from notion.local_server import LocalNotionServer
+
+
+def timed(label, count, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<8} {count:>6} in {elapsed:6.2f}s ({count / elapsed:7.1f}/s)")
+    return result
+
+
+def load_planner():
+    # the constructor only starts loading in the background, so wait for the tasks as well
+    planner = Planner()
+    planner.wait_until_ready()
+    return planner
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+
+    # keep the task cache and the journal of the run out of the working tree
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['NOTION_CACHE_DIR'] = directory
+        os.environ['NOTION_JOURNAL_PATH'] = os.path.join(directory, 'journal.jsonl')
+        run(count)
+
+
+def run(count):
+    # 50ms per request, and a server-side limit that answers with 429s above 10 requests per second
+    server = LocalNotionServer(latency=0.05, rate_limit=10, retry_after=1).start()
+    for i in range(count):
+        server.add_page(f'seed {i}', '2025-01-01T09:00:00.000+09:00', None, '일상')
+    notion_api.configure(api_key='benchmark', database_id=server.database_id, base_url=server.url, rate_limit=10)
+
+    planner = timed('load', count, load_planner)
+    tasks = [Task(None, f'task {i}', '2030-01-01 09:00', '이벤트') for i in range(count)]
+    timed('add', count, planner.add_tasks, tasks)
+    timed('edit', count, planner.edit_tasks, {task.task_id: Task(task.task_id, task.name + '!', '2030-01-02 09:00', '일상') for task in tasks})
+    timed('delete', count, planner.delete_tasks, [task.task_id for task in tasks])
+
+    print(f"responses: {server.status_counts}")
+    planner.close()
+    server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# Checks the write-behind journal against the local Notion stand-in server: replay, coalescing,
+# add + delete, uncertain adds and dropped mutations. Exits non-zero on the first failed check.
+# usage: python benchmark/write_behind_check.py
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ['NOTION_WRITE_BEHIND'] = '1'
+os.environ['NOTION_FLUSH_INTERVAL'] = '3600'    # flushes only when woken or asked to
+
+from notion import Planner, Task, notion_api
+from notion.local_server import LocalNotionServer
+from notion.notion_client import NotionClient
+from notion.write_behind import MutationJournal, coalesce
+
+
+def check(label, condition):
+    print(f"{'ok' if condition else 'FAILED'}  {label}")
+    if not condition:
+        sys.exit(1)
+
+
+def task(name, group='일상'):
+    return Task(None, name, '2030-01-01 09:00', group)
+
+
+def live_pages(server, name=None):
+    return [page for page in server.pages.values()
+            if not page['archived'] and (name is None or page['properties']['이름']['title'][0]['plain_text'] == name)]
+
+
+def check_coalesce():
+    journal = [
+        {'seq': 1, 'op': 'add', 'task_id': 'local-a', 'task': {'name': 'a'}},
+        {'seq': 2, 'op': 'edit', 'task_id': 'local-a', 'task': {'name': 'a2'}},
+        {'seq': 3, 'op': 'add', 'task_id': 'local-b', 'task': {'name': 'b'}},
+        {'seq': 4, 'op': 'delete', 'task_id': 'local-b'},
+        {'seq': 5, 'op': 'edit', 'task_id': 'page-c', 'task': {'name': 'c1'}},
+        {'seq': 6, 'op': 'edit', 'task_id': 'page-c', 'task': {'name': 'c2'}},
+        {'seq': 7, 'op': 'edit', 'task_id': 'page-d', 'task': {'name': 'd'}},
+        {'seq': 8, 'op': 'delete', 'task_id': 'page-d'},
+        {'seq': 9, 'op': 'edit', 'task_id': 'local-e', 'task': {'name': 'e'}},
+    ]
+    operations = {operation['task_id']: operation for operation in coalesce(journal, lambda task_id: {'local-e': 'page-e'}.get(task_id, task_id))}
+    check("add + edit is one add of the final state", operations['local-a']['op'] == 'add' and operations['local-a']['task'] == {'name': 'a2'})
+    check("add + delete sends nothing", operations['local-b']['op'] == 'noop' and operations['local-b']['seqs'] == [3, 4])
+    check("edits keep the last one", operations['page-c']['op'] == 'edit' and operations['page-c']['task'] == {'name': 'c2'})
+    check("edit + delete is a delete", operations['page-d']['op'] == 'delete')
+    check("temporary ids resolve to the page id", 'page-e' in operations)
+
+
+def check_replay(directory):
+    path = os.path.join(directory, 'replay.journal.jsonl')
+    journal = MutationJournal(path)
+    first = journal.append('add', 'local-a', task('a'))
+    second = journal.append('edit', 'page-b', task('b'))
+    journal.append('delete', 'page-c')
+    journal.ack([second], {'local-a': 'page-a'})
+    journal.mark_uncertain(first, '2030-01-01T00:00:00+00:00', {'name': 'a'})
+    journal.close()
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"seq": 9, "op": "ed')      # torn by a crash
+
+    journal = MutationJournal(path)
+    pending = journal.pending()
+    check("replay keeps the unacknowledged entries", [entry['seq'] for entry in pending] == [1, 3])
+    check("replay restores the uncertain mark", pending[0].get('uncertain', {}).get('since') == '2030-01-01T00:00:00+00:00')
+    check("replay restores the id map", journal.resolve('local-a') == 'page-a')
+    journal.ack([entry['seq'] for entry in pending])
+    journal.close()
+    with open(path, encoding='utf-8') as f:
+        records = [json.loads(line) for line in f]
+    check("the journal is compacted once nothing is pending", records == [{'ack': [], 'id_map': {'local-a': 'page-a'}}])
+
+
+def open_planner(server):
+    planner = Planner(NotionClient('check', server.database_id, base_url=server.url, rate_limit=1000))
+    planner.wait_until_ready()
+    return planner
+
+
+def uncertain_journal(planner, name, since):
+    # an add whose request timed out: journaled and marked uncertain, as a flush leaves it
+    path = planner._journal_path()
+    planner.close()
+    journal = MutationJournal(path)
+    seq = journal.append('add', 'local-' + name, task(name))
+    journal.mark_uncertain(seq, since, journal.pending()[-1]['task'])
+    journal.close()
+
+
+def check_planner(server):
+    since = (datetime.now(timezone.utc) - timedelta(minutes=1)).isoformat()
+
+    planner = open_planner(server)
+    added = planner.add_tasks([task('kept'), task('gone')])
+    check("adds are journaled", added == '2 Tasks added successfully!')
+    kept, gone = (planner.get_tasks_by_name(name)[0].task_id for name in ('kept', 'gone'))
+    planner.delete_task(gone)
+    planner.edit_task(kept, task('kept!'))
+    planner.flush()
+    check("the flushed adds and edit reached Notion", len(live_pages(server, 'kept!')) == 1 and not live_pages(server, 'kept'))
+    check("add + delete created no page", not live_pages(server, 'gone'))
+    check("the local task has the Notion id", planner.get_tasks_by_name('kept!')[0].task_id in server.pages)
+
+    # the timed-out add did create its page: the flush takes it over instead of adding it again
+    uncertain_journal(planner, 'created', since)
+    server.add_page('created', task('created').start.isoformat(), None, '일상')
+    planner = open_planner(server)
+    planner.flush()
+    check("an uncertain add takes over the page it created", len(live_pages(server, 'created')) == 1)
+    check("and the local task gets its id", planner.get_tasks_by_name('created')[0].task_id in server.pages)
+
+    # it did not: the flush sends it again
+    uncertain_journal(planner, 'lost', since)
+    planner = open_planner(server)
+    planner.flush()
+    check("an uncertain add without a page is sent again", len(live_pages(server, 'lost')) == 1)
+    check("nothing is left in the journal", planner.write_behind.pending_count() == 0 and planner.write_errors() == [])
+
+    # a mutation Notion rejects is dropped and reported once
+    planner.edit_task('no-such-page', task('x'))
+    planner.flush()
+    errors = planner.write_errors()
+    check("a dropped edit is reported", len(errors) == 1 and errors[0].startswith('Dropped edit of Task[no-such-page]'))
+    check("and only once", planner.write_errors() == [])
+
+    # a rate-limited flush keeps the mutation and reports why it waits
+    server.rate_429, server.retry_after = 1.0, 0
+    planner.add_task(task('later'))
+    planner.flush()
+    check("a throttled add stays pending", planner.write_behind.pending_count() == 1 and 'not written to Notion yet' in planner.write_errors()[0])
+    server.rate_429 = 0.0
+    planner.flush()
+    check("and is sent once Notion accepts it", len(live_pages(server, 'later')) == 1 and planner.write_errors() == [])
+    planner.close()
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        os.environ['NOTION_CACHE_DIR'] = directory
+        check_coalesce()
+        check_replay(directory)
+
+        server = LocalNotionServer().start()
+        notion_api.configure(api_key='check', database_id=server.database_id, base_url=server.url)
+        try:
+            check_planner(server)
+        finally:
+            server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 from notion import Planner
+from notion import task_io
+from command.JobManager import JobManager, current_job
 
 
 class CommandHandler:
@@ -6,8 +8,8 @@ class CommandHandler:
         self.planner = Planner()
 
     # all
-    def handle_task_show(self):
-        return self.planner.show_tasks()
+    def handle_task_show(self, **options):
+        return self.planner.show_tasks(**options)
 
     def handle_task_add(self, task):
         return self.planner.add_task(task)
@@ -17,7 +19,44 @@ class CommandHandler:
 
     def handle_task_edit(self, task_id, new_task):
         return self.planner.edit_task(task_id, new_task)
-    
+
+    # user-only: these read and write files on this machine
+    # run as a job, they report their progress to it and an import stops when it is cancelled
+    def handle_task_import(self, path, **options):
+        job = current_job()
+        if job is not None:
+            options.update(progress=job.report, cancelled=job.cancelled)
+        return task_io.import_tasks(self.planner, path, **options)
+
+    def handle_task_export(self, path, **options):
+        job = current_job()
+        if job is not None:
+            options.update(progress=job.report)
+        return task_io.export_tasks(self.planner, path, **options)
+
+    # jobs
+    def handle_jobs(self):
+        jobs = JobManager().list()
+        if not jobs:
+            return "No jobs found."
+        return "\n".join(job.summary() for job in jobs)
+
+    def handle_job_show(self, job_id):
+        job = JobManager().get(job_id)
+        if job is None:
+            return f"Invalid job id: {job_id}"
+        return str(job)
+
+    def handle_job_cancel(self, job_id):
+        job = JobManager().cancel(job_id)
+        if job is None:
+            return f"Invalid job id: {job_id}"
+        if job.status == 'cancelled':
+            return f"Job[{job_id}] cancelled."
+        if job.done:
+            return f"Job[{job_id}] has already {job.status}."
+        return f"Cancellation of Job[{job_id}] requested; a running command stops at its next checkpoint."
+
     # user-only
     def handle_show_command_spec(self, command_opcode):
         import json
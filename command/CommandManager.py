@@ -1,15 +1,28 @@
+import re
 import threading
 import shlex
-from requests.exceptions import HTTPError
+from concurrent.futures import ThreadPoolExecutor
+from requests.exceptions import HTTPError, RequestException
+
+from notion import bulk
 
 from command import CommandHandler
-from command import register_commands, register_command_specs
+from command import register_commands, register_command_specs, compile_validators
+from command.commands.CommandValidator import CommandValidationError
+from command.JobManager import JobManager
+
+
+# 커맨드 끝에 공백으로 떨어져 단독으로 오는 '&'
+background_pattern = re.compile(r'\s+&\s*$')
 
 
 class CommandManager:
     _instance = None
     _lock = threading.Lock()  # 클래스 수준의 Lock 객체
 
+    # 첫 번째 operand가 변경할 task_id인 커맨드
+    ordered_opcodes = ('edit', 'delete')
+
     def __new__(cls):
         if cls._instance is None:
             with cls._lock:
@@ -25,6 +38,8 @@ class CommandManager:
         self.command_handler = CommandHandler()
         self.handler_map = {}
         self.command_spec_map = {}
+        self.validator_map = {}
+        self.job_manager = JobManager()
         self._register()
 
         self._initialized = True
@@ -42,11 +57,37 @@ class CommandManager:
         for command_spec in command_spec_list:
             self.command_spec_map[command_spec["opcode"]] = command_spec
             print(f"Registered command spec: {command_spec['opcode']}")
+
+        # spec마다 operand 검증기를 미리 컴파일
+        self.validator_map = compile_validators(command_spec_list)
     
     # 외부에서 커맨드 실행 요청 시 사용
     # 커맨드 실행 시 CommandHandler의 execute 메소드 호출
     # 커맨드 실행 후 결과값을 리턴
     def execute_command(self, command: str):
+        # 끝에 '&'가 붙은 커맨드는 백그라운드 잡으로 제출
+        background = background_pattern.search(command)
+        if background:
+            return self.submit_command(command[:background.start()])
+
+        opcode, operands, response = self._prepare(command)
+        if response is not None:
+            return response
+        return self._execute_checked(opcode, operands)
+
+    # 커맨드를 잡으로 제출하고 잡 id를 바로 리턴
+    # 디코딩과 검증은 제출 전에 하므로 잘못된 커맨드는 잡이 되지 않음
+    def submit_command(self, command: str):
+        opcode, operands, response = self._prepare(command)
+        if response is not None:
+            return response
+
+        job = self.job_manager.submit(command.strip(), lambda _: self._execute_checked(opcode, operands),
+                                      is_error=is_error_response)
+        return f"Job[{job.job_id}] submitted: {job.command}\nUse '/job {job.job_id}' to see its progress."
+
+    # 디코딩과 operand 검증, 실패하면 응답 문자열을 함께 리턴
+    def _prepare(self, command: str):
         # Decode the command if needed
         try:                                                    # try-execute for decoding command
             opcode, operands = self._decode(command)
@@ -54,13 +95,26 @@ class CommandManager:
             # Handle ValueErrors (e.g., invalid command format)
             response = f"Error decoding command: {command}\n{str(e)}"
             response += "\nPlease check the command format."
-            return response
+            return None, None, response
 
         if opcode is None:
             response = "Invalid command opcode."
             response += "\nPlease check the command opcode."
-            return response
-        
+            return None, None, response
+
+        # Validate the operands locally, before any remote call
+        validator = self.validator_map.get(opcode)
+        if validator is not None:
+            try:
+                operands = validator(operands)
+            except CommandValidationError as e:
+                response = f"Invalid arguments for '/{opcode}': {str(e)}"
+                response += f"\nUsage: {validator.usage}"
+                return None, None, response
+
+        return opcode, operands, None
+
+    def _execute_checked(self, opcode, operands):
         # Execute the command
         try:                                                    # try-execute for executing command
             response = self._execute(opcode, operands)
@@ -68,6 +122,10 @@ class CommandManager:
             # Handle HTTP errors
             response = f"Error executing command '/{opcode}'\n{str(e)}"
             response += "\nPlease check the task_id available."
+        except RequestException as e:                               # Timeout/ConnectionError from the Notion client
+            # Handle network errors
+            response = f"Error executing command '/{opcode}'\n{str(e)}"
+            response += "\nPlease check the network connection."
         except ValueError as e:                                     # ValueError from datetime in task.py
             # Handle ValueErrors (e.g., invalid date format)
             response = f"Error executing command '/{opcode}'\n{str(e)}"
@@ -79,6 +137,41 @@ class CommandManager:
         
         return response
     
+    # 배치 실행
+    # 커맨드를 모두 먼저 디코딩, 검증한 뒤 서로 독립적인 커맨드는 동시에 실행
+    # 같은 task_id를 다루는 커맨드는 주어진 순서대로 실행, task_id는 검증기가 정규화한 값으로 비교
+    # 결과는 입력 순서대로 리턴
+    def execute_batch(self, commands, workers=None):
+        commands = [command.strip() for command in commands]
+        commands = [command for command in commands if command and not command.startswith('#')]
+
+        responses = [None] * len(commands)
+        prepared = {}
+        chains = {}     # task_id -> indexes of its commands, in order
+        for index, command in enumerate(commands):
+            if background_pattern.search(command):
+                responses[index] = self.execute_command(command)       # submitted as a job, returns at once
+                continue
+            opcode, operands, response = self._prepare(command)
+            if response is not None:
+                responses[index] = response
+                continue
+            prepared[index] = (opcode, operands)
+            key = operands[0] if opcode in self.ordered_opcodes and operands else index
+            chains.setdefault(key, []).append(index)
+
+        def run_chain(indexes):
+            for index in indexes:
+                try:
+                    responses[index] = self._execute_checked(*prepared[index])
+                except Exception as e:      # one failed command must not stop the others of its chain
+                    responses[index] = f"Error executing command '{commands[index]}'\n{str(e)}"
+
+        with ThreadPoolExecutor(max_workers=workers or bulk.max_workers) as executor:
+            list(executor.map(run_chain, chains.values()))
+
+        return list(zip(commands, responses))
+
     # 커맨드 디코딩
     # 커맨드의 opcode와 operand를 분리
     # 커맨드의 opcode는 '/'로 시작
@@ -110,6 +203,30 @@ class CommandManager:
             raise CommandNotRecognizedError(opcode)
         
 
+def is_error_response(response):
+    return not response or response.startswith(('Error', 'Invalid'))
+
+
+def format_batch_results(results):
+    # one row per command: number, status, command and the first line of the response
+    rows = []
+    for number, (command, response) in enumerate(results, start=1):
+        status = 'failed' if is_error_response(response) else 'ok'
+        first_line = response.splitlines()[0] if response else ''
+        rows.append((str(number), status, command, first_line))
+
+    headers = ('#', 'status', 'command', 'response')
+    widths = [max(len(row[i]) for row in rows + [headers]) for i in range(3)]
+    lines = [' | '.join(value.ljust(width) for value, width in zip(headers, widths)) + ' | ' + headers[3]]
+    lines.append('-+-'.join('-' * width for width in widths) + '-+-' + '-' * len(headers[3]))
+    for row in rows:
+        lines.append(' | '.join(value.ljust(width) for value, width in zip(row, widths)) + ' | ' + row[3])
+
+    failed = sum(1 for row in rows if row[1] == 'failed')
+    lines.append(f"{len(rows) - failed}/{len(rows)} commands succeeded.")
+    return "\n".join(lines)
+
+
 class CommandNotRecognizedError(Exception):
     def __init__(self, opcode, message="Command not recognized"):
         self.opcode = opcode
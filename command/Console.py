@@ -1,4 +1,7 @@
-from command import CommandManager
+import sys
+import time
+
+from command import CommandManager, format_batch_results
 
 
 def main():
@@ -12,3 +15,33 @@ def main():
         response = command_manager.execute_command(command)
         if response:
             print(response)
+
+        # 백그라운드 쓰기에서 버려진 변경은 여기서 알림
+        for message in command_manager.command_handler.planner.write_errors():
+            print(message)
+
+    # 실행 중인 잡은 끝날 때까지 기다린 뒤 종료
+    unfinished = [job for job in command_manager.job_manager.list() if not job.done]
+    if unfinished:
+        print(f"Waiting for {len(unfinished)} jobs to finish...")
+    command_manager.job_manager.shutdown()
+
+
+# 파일 또는 표준 입력('-')의 커맨드를 한꺼번에 실행하고 결과 표를 출력
+def run_batch(path, workers=None):
+    command_manager = CommandManager()
+
+    if path == '-':
+        commands = sys.stdin.read().splitlines()
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            commands = f.read().splitlines()
+
+    start = time.perf_counter()
+    results = command_manager.execute_batch(commands, workers)
+    elapsed = time.perf_counter() - start
+
+    print(format_batch_results(results))
+    print(f"Finished in {elapsed:.2f}s")
+    return results
+
@@ -0,0 +1,169 @@
+import itertools
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+_current = threading.local()
+
+
+# 현재 스레드에서 실행 중인 Job, 잡 밖에서는 None
+def current_job():
+    return getattr(_current, 'job', None)
+
+
+class Job:
+    def __init__(self, job_id, command):
+        self.job_id = job_id
+        self.command = command
+        self.status = QUEUED
+        self.progress = None
+        self.result = None
+        self.submitted_at = datetime.now()
+        self.started = None         # perf_counter times
+        self.finished = None
+        self.future = None
+        self._cancel_requested = threading.Event()
+        self._cancel_observed = False
+
+    # 오래 걸리는 커맨드가 진행 상황을 남길 때 사용
+    def report(self, message):
+        self.progress = message
+
+    # 오래 걸리는 커맨드가 중간중간 확인, True를 받으면 멈춰야 함
+    def cancelled(self):
+        if self._cancel_requested.is_set():
+            self._cancel_observed = True
+            return True
+        return False
+
+    @property
+    def done(self):
+        return self.status in (SUCCEEDED, FAILED, CANCELLED)
+
+    @property
+    def elapsed(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.perf_counter()) - self.started
+
+    def summary(self):
+        string = f"Job[{self.job_id}][{self.status}] {self.command}"
+        if self.started is not None:
+            string += f" ({self.elapsed:.1f}s)"
+        if self.progress and not self.done:
+            string += f" - {self.progress}"
+        return string
+
+    def __str__(self):
+        lines = [
+            f"Job[{self.job_id}]",
+            f"Command: {self.command}",
+            f"Status: {self.status}",
+            f"Submitted: {self.submitted_at.strftime('%Y-%m-%d %H:%M:%S')}",
+        ]
+        if self.started is not None:
+            lines.append(f"Elapsed: {self.elapsed:.2f}s")
+        if self.progress:
+            lines.append(f"Progress: {self.progress}")
+        if self.result is not None:
+            lines.append(f"Result:\n{self.result}")
+        return "\n".join(lines)
+
+
+# finished jobs are kept up to `history`; a running job stops only if its command checks current_job().cancelled()
+class JobManager:
+    _instance = None
+    _lock = threading.Lock()  # 클래스 수준의 Lock 객체
+
+    history = 100
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:   # 이중 잠금 확인
+                    cls._instance = super().__new__(cls)
+            cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        if self._initialized:
+            return
+
+        workers = int(os.getenv('NOTION_JOB_WORKERS', '4'))
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='job')
+        self.jobs = OrderedDict()       # job_id -> Job, oldest first
+        self._ids = itertools.count(1)
+        self._jobs_lock = threading.Lock()
+
+        self._initialized = True
+
+    # run(command) -> 응답 문자열, 워커 스레드에서 실행
+    def submit(self, command, run, is_error=None):
+        with self._jobs_lock:
+            job = Job(str(next(self._ids)), command)
+            self.jobs[job.job_id] = job
+            self._trim()
+        job.future = self.executor.submit(self._run, job, run, is_error)
+        return job
+
+    def _run(self, job, run, is_error):
+        if job._cancel_requested.is_set():     # cancelled before a worker picked it up
+            job.status = CANCELLED
+            return
+        job.started = time.perf_counter()
+        job.status = RUNNING
+        _current.job = job
+        try:
+            job.result = run(job.command)
+            if job._cancel_observed:
+                status = CANCELLED
+            elif is_error is not None and is_error(job.result):
+                status = FAILED
+            else:
+                status = SUCCEEDED
+        except Exception as e:      # a failed job must not take the worker down
+            job.result = f"Error executing command '{job.command}'\n{str(e)}"
+            status = FAILED
+        finally:
+            _current.job = None
+            job.finished = time.perf_counter()
+        job.status = status     # last, so a finished job always has its result and timing
+
+    def _trim(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.done]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self.jobs[job_id]
+
+    def get(self, job_id):
+        with self._jobs_lock:
+            return self.jobs.get(job_id)
+
+    def list(self):
+        with self._jobs_lock:
+            return list(self.jobs.values())
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is None:
+            return None
+        if not job.done:
+            job._cancel_requested.set()
+            if job.future is not None and job.future.cancel():     # still queued
+                job.status = CANCELLED
+        return job
+
+    def shutdown(self, cancel=False):
+        if cancel:
+            for job in self.list():
+                self.cancel(job.job_id)
+        self.executor.shutdown(wait=True)
@@ -1,3 +1,3 @@
 from .CommandHandler import CommandHandler
-from .commands import register_commands, register_command_specs
-from .CommandManager import CommandManager
+from .commands import register_commands, register_command_specs, compile_validators, validate_command
+from .CommandManager import CommandManager, format_batch_results
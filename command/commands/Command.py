@@ -1,10 +1,13 @@
 from abc import ABC, abstractmethod
 from command import CommandHandler
 from notion import Task
+from notion import task_io
+from datetime import datetime
 import os
 import json
 
-command_spec_directory = 'command/commands/command_specs'
+# relative to this file, so the specs are found from any working directory
+command_spec_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'command_specs')
 
 
 def register_commands(handler: CommandHandler):
@@ -14,6 +17,11 @@ def register_commands(handler: CommandHandler):
     command_list.append(CommandTaskDelete(handler))
     command_list.append(CommandTaskEdit(handler))
     command_list.append(CommandShowCommandSpec(handler))
+    command_list.append(CommandTaskImport(handler))
+    command_list.append(CommandTaskExport(handler))
+    command_list.append(CommandJobList(handler))
+    command_list.append(CommandJobShow(handler))
+    command_list.append(CommandJobCancel(handler))
 
     return command_list
 
@@ -42,14 +50,30 @@ class Command(ABC):
 
 
 class CommandTaskShow(Command):
+    # optional key=value operands -> (keyword of Planner.show_tasks, parser)
+    options = {
+        'limit': ('limit', int),
+        'offset': ('offset', int),
+        'group': ('group', str),
+        'from': ('start', lambda value: datetime.fromisoformat(value).astimezone()),
+        'to': ('end', lambda value: datetime.fromisoformat(value).astimezone())
+    }
+
     def __init__(self, handler):
         super().__init__(handler, "show")
     
     def handle(self, operands):
-        if len(operands) == 0:
-            return self.handler.handle_task_show()
-        else:
-            return "Invalid number of arguments for task show."
+        options = {}
+        for operand in operands:
+            key, separator, value = operand.partition('=')
+            if not separator or key not in self.options:
+                return f"Invalid argument for task show: {operand}"
+            keyword, parse = self.options[key]
+            options[keyword] = parse(value)     # a bad number or date raises ValueError
+
+        if options.get('limit', 0) < 0 or options.get('offset', 0) < 0:
+            return "Invalid argument for task show: limit and offset must not be negative."
+        return self.handler.handle_task_show(**options)
 
 
 class CommandTaskAdd(Command):
@@ -120,4 +144,99 @@ class CommandShowCommandSpec(Command):
             command_opcode = operands[0]
             return self.handler.handle_show_command_spec(command_opcode)
         else:
-            return "Invalid number of arguments for command spec."
\ No newline at end of file
+            return "Invalid number of arguments for command spec."
+
+
+def _parse_file_operands(operands, options):
+    # <path> followed by optional key=value operands -> (path, keyword arguments)
+    if not operands or '=' in operands[0]:
+        raise ValueError("a file path is required.")
+    path, arguments = operands[0], {}
+    for operand in operands[1:]:
+        key, separator, value = operand.partition('=')
+        if not separator or key not in options:
+            raise ValueError(f"unknown argument {operand}")
+        keyword, parse = options[key]
+        arguments[keyword] = parse(value)
+    task_io.detect_format(path, arguments.get('format'))     # raises ValueError for an unknown format
+    return path, arguments
+
+
+class CommandTaskImport(Command):
+    options = {
+        'format': ('format', str.lower),
+        'chunk': ('chunk_size', int)
+    }
+
+    def __init__(self, handler):
+        super().__init__(handler, "import")
+
+    def handle(self, operands):
+        try:
+            path, options = _parse_file_operands(operands, self.options)
+        except ValueError as e:
+            return f"Invalid argument for task import: {e}"
+        if options.get('chunk_size', 1) < 1:
+            return "Invalid argument for task import: chunk must be at least 1."
+
+        try:
+            return self.handler.handle_task_import(path, **options)
+        except OSError as e:
+            return f"Error reading file: {path}\n{str(e)}"
+
+
+class CommandTaskExport(Command):
+    options = {
+        'format': ('format', str.lower),
+        'group': ('group', str)
+    }
+
+    def __init__(self, handler):
+        super().__init__(handler, "export")
+
+    def handle(self, operands):
+        try:
+            path, options = _parse_file_operands(operands, self.options)
+        except ValueError as e:
+            return f"Invalid argument for task export: {e}"
+
+        try:
+            return self.handler.handle_task_export(path, **options)
+        except OSError as e:
+            return f"Error writing file: {path}\n{str(e)}"
+
+
+
+class CommandJobList(Command):
+    def __init__(self, handler):
+        super().__init__(handler, "jobs")
+
+    def handle(self, operands):
+        if len(operands) == 0:
+            return self.handler.handle_jobs()
+        else:
+            return "Invalid number of arguments for job list."
+
+
+class CommandJobShow(Command):
+    def __init__(self, handler):
+        super().__init__(handler, "job")
+
+    def handle(self, operands):
+        if len(operands) == 1:
+            job_id = operands[0]
+            return self.handler.handle_job_show(job_id)
+        else:
+            return "Invalid number of arguments for job status."
+
+
+class CommandJobCancel(Command):
+    def __init__(self, handler):
+        super().__init__(handler, "cancel")
+
+    def handle(self, operands):
+        if len(operands) == 1:
+            job_id = operands[0]
+            return self.handler.handle_job_cancel(job_id)
+        else:
+            return "Invalid number of arguments for job cancellation."
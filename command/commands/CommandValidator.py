@@ -0,0 +1,144 @@
+import shlex
+import uuid
+from datetime import datetime
+
+
+class CommandValidationError(ValueError):
+    pass
+
+
+# operand checks by spec type; each returns the normalized operand or raises CommandValidationError
+def check_string(value):
+    return value
+
+
+def check_uuid(value):
+    prefix = 'local-' if value.startswith('local-') else ''     # temporary ids of the write-behind journal
+    try:
+        return prefix + str(uuid.UUID(value[len(prefix):]))
+    except ValueError:
+        raise CommandValidationError(f"'{value}' is not a task id")
+
+
+def check_datetime(value):
+    if value.lower() == 'none':
+        return 'None'
+    try:
+        datetime.fromisoformat(value)
+    except ValueError:
+        raise CommandValidationError(f"'{value}' is not a datetime, expected 'YYYY-MM-DD HH:MM'")
+    return value
+
+
+def check_optional_datetime(value):
+    # an optional bound is left out rather than given as none
+    if value.lower() == 'none':
+        raise CommandValidationError(f"'{value}' is not a datetime, leave the option out instead")
+    return check_datetime(value)
+
+
+def check_integer(value):
+    try:
+        number = int(value)
+    except ValueError:
+        raise CommandValidationError(f"'{value}' is not an integer")
+    if number < 0:
+        raise CommandValidationError(f"'{value}' must not be negative")
+    return str(number)
+
+
+type_checks = {
+    'string': check_string,
+    'string[uuid]': check_uuid,
+    'string[datetime]': check_datetime,
+    'integer': check_integer
+}
+
+# checks of `key=value` operands that differ from the positional ones
+optional_type_checks = {
+    'string[datetime]': check_optional_datetime
+}
+
+
+# required parameters are positional in spec order, optional ones are key=value operands
+class CommandValidator:
+    def __init__(self, spec):
+        self.opcode = spec['opcode']
+        self.usage = spec.get('usage', '')
+        self.positional = []    # (name, check, is a date range)
+        self.optional = {}      # name -> check
+        for name, parameter in spec.get('parameters', {}).items():
+            parameter_type = parameter.get('type', 'string')
+            if parameter_type not in type_checks:
+                raise ValueError(f"Unknown parameter type in command spec '{spec['name']}': {parameter_type}")
+            if parameter.get('optional'):
+                self.optional[name] = optional_type_checks.get(parameter_type, type_checks[parameter_type])
+            else:
+                self.positional.append((name, type_checks[parameter_type], parameter_type == 'string[datetime]'))
+        self.has_range = any(is_range for _, _, is_range in self.positional)
+
+    def _arity(self):
+        count = len(self.positional)
+        return f"{count} or {count + 1}" if self.has_range else f"{count}"
+
+    def __call__(self, operands):
+        positional, options = [], []
+        for operand in operands:
+            key, separator, value = operand.partition('=')
+            if separator and key in self.optional:
+                options.append(f"{key}={self.optional[key](value)}")
+            else:
+                positional.append(operand)
+
+        extra = len(positional) - len(self.positional)
+        if extra not in (0, 1) or (extra == 1 and not self.has_range):
+            raise CommandValidationError(f"expected {self._arity()} operands, got {len(positional)}")
+
+        normalized = []
+        values = iter(positional)
+        for name, check, is_range in self.positional:
+            if is_range and extra == 1:
+                start, end = check(next(values)), check(next(values))
+                if start == 'None':
+                    raise CommandValidationError(f"the {name} range needs a start")
+                if end != 'None' and datetime.fromisoformat(end).astimezone() < datetime.fromisoformat(start).astimezone():
+                    raise CommandValidationError(f"the {name} range ends before it starts")
+                normalized += [start, end]
+            else:
+                normalized.append(check(next(values)))
+
+        return normalized + options
+
+
+def compile_validators(command_specs):
+    return {command_spec['opcode']: CommandValidator(command_spec) for command_spec in command_specs}
+
+
+_validators = None
+
+
+def validate_command(command, validators=None):
+    # None when the command line is valid, otherwise the reason
+    global _validators
+    if validators is None:
+        if _validators is None:
+            from command.commands.Command import register_command_specs
+            _validators = compile_validators(register_command_specs())
+        validators = _validators
+
+    try:
+        parts = shlex.split(command)
+    except ValueError as e:
+        return str(e)
+    if not parts or not parts[0].startswith('/'):
+        return "a command starts with '/'"
+
+    opcode = parts[0].lstrip('/')
+    validator = validators.get(opcode)
+    if validator is None:
+        return f"unknown command '/{opcode}'"
+    try:
+        validator(parts[1:])
+    except CommandValidationError as e:
+        return f"{e}, usage: {validator.usage}"
+    return None
@@ -1 +1,2 @@
-from .Command import register_commands, register_command_specs
\ No newline at end of file
+from .Command import register_commands, register_command_specs
+from .CommandValidator import CommandValidator, CommandValidationError, compile_validators, validate_command
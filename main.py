@@ -1,9 +1,19 @@
+import argparse
+
 import command.Console as console
 
 
 def main():
-    console.main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--batch', metavar='FILE', help="run the commands of FILE ('-' for stdin) and exit")
+    parser.add_argument('--workers', type=int, default=None, help="number of commands run at once in batch mode")
+    args = parser.parse_args()
+
+    if args.batch:
+        console.run_batch(args.batch, args.workers)
+    else:
+        console.main()
 
 if __name__ == "__main__":
     main()
-    
\ No newline at end of file
+    
@@ -1,10 +1,29 @@
+from dotenv import load_dotenv
+
+# the modules below read settings such as NOTION_WRITE_BEHIND when they are imported, so load .env first
+load_dotenv()
+
 from .task import Task
+from .notion_client import NotionClient
 from .planner import Planner
 from .notion_api import (
+    query_database,
+    iter_tasks,
     get_tasks,
     get_tasks_by_group,
     get_tasks_after_now,
+    get_changed_tasks,
+    get_task_ids,
     add_task_to_remote,
     delete_task_from_remote,
     edit_task_from_remote
-)
\ No newline at end of file
+)
+from .planner_pool import PlannerPool
+
+
+# asyncio costs ~30ms to import, so the async planner is imported on first use
+def __getattr__(name):
+    if name == 'AsyncPlanner':
+        from .async_planner import AsyncPlanner
+        return AsyncPlanner
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,57 @@
+import asyncio
+import os
+import weakref
+
+from notion import notion_api
+
+
+# the pooled client is thread-safe, so the async API runs the blocking calls on worker threads
+# and bounds how many of them are in flight at once
+max_concurrency = int(os.getenv('NOTION_MAX_CONCURRENCY', '10'))
+
+_semaphores = weakref.WeakKeyDictionary()     # one semaphore per event loop
+
+
+def _semaphore():
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(max_concurrency)
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+async def _run(func, *args, **kwargs):
+    async with _semaphore():
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+
+# request functions
+async def request_get(endpoint, client=None):
+    return await _run(notion_api.request_get, endpoint, client)
+
+async def request_post(endpoint, json_data, client=None):
+    return await _run(notion_api.request_post, endpoint, json_data, client)
+
+async def request_patch(endpoint, json_data, client=None):
+    return await _run(notion_api.request_patch, endpoint, json_data, client)
+
+
+# functions
+async def get_tasks(client=None):
+    return await _run(notion_api.get_tasks, client=client)
+
+async def get_tasks_by_group(group_name, client=None):
+    return await _run(notion_api.get_tasks_by_group, group_name, client=client)
+
+async def get_tasks_after_now(client=None):
+    return await _run(notion_api.get_tasks_after_now, client=client)
+
+async def add_task_to_remote(task, client=None):
+    return await _run(notion_api.add_task_to_remote, task, client)
+
+async def delete_task_from_remote(task_id, client=None):
+    return await _run(notion_api.delete_task_from_remote, task_id, client)
+
+async def edit_task_from_remote(task_id, task, client=None):
+    return await _run(notion_api.edit_task_from_remote, task_id, task, client)
@@ -0,0 +1,195 @@
+import asyncio
+
+from requests.exceptions import HTTPError
+
+from notion import async_notion_api, bulk
+from notion.planner import Planner
+
+
+# remote calls run concurrently through async_notion_api; local steps that take the writer lock run on a worker thread
+class AsyncPlanner:
+    def __init__(self, planner=None):
+        self.planner = planner if planner is not None else Planner()
+
+    @property
+    def task_list(self):
+        return self.planner.task_list
+
+    @property
+    def status(self):
+        return self.planner.status
+
+    def write_errors(self):
+        return self.planner.write_errors()
+
+    async def wait_until_ready(self):
+        # waits off the event loop, so other coroutines keep running while the planner loads
+        await asyncio.to_thread(self.planner.wait_until_ready)
+
+    async def load_tasks(self):
+        await asyncio.to_thread(self.planner.load_tasks)
+
+    async def sync_tasks(self, full=False):
+        return await asyncio.to_thread(self.planner.sync_tasks, full)
+
+    async def show_tasks(self, limit=None, offset=0, group=None, start=None, end=None):
+        await self.wait_until_ready()
+        return self.planner.show_tasks(limit, offset, group, start, end)
+
+    async def show_tasks_by_group(self, group):
+        await self.wait_until_ready()
+        return self.planner.show_tasks_by_group(group)
+
+    async def show_tasks_after_now(self):
+        await self.wait_until_ready()
+        return self.planner.show_tasks_after_now()
+
+    async def show_tasks_between(self, start, end):
+        await self.wait_until_ready()
+        return self.planner.show_tasks_between(start, end)
+
+    async def _gather(self, action, func, items, keys):
+        # every item runs to the end; a failure is recorded for its item like `bulk.run_bulk` does
+        outcomes = await asyncio.gather(*(func(item) for item in items), return_exceptions=True)
+        results = []
+        for key, outcome in zip(keys, outcomes):
+            if isinstance(outcome, Exception):
+                results.append(bulk.BulkItemResult(key, bulk.FAILED, error=outcome))
+            elif isinstance(outcome, BaseException):    # e.g. cancellation, not an item failure
+                raise outcome
+            else:
+                results.append(bulk.BulkItemResult(key, bulk.SUCCEEDED, task_id=outcome))
+        return bulk.BulkResult(action, results)
+
+    # add task
+    async def add_task(self, task):
+        if self.planner.write_behind is not None:
+            await self.wait_until_ready()
+            return await asyncio.to_thread(self.planner.add_task, task)      # journaled locally, no remote round-trip
+
+        with self.planner._operation():     # a planner closed meanwhile keeps its cache open until this ends
+            task_id = await async_notion_api.add_task_to_remote(task, self.planner.client)
+            task.task_id = task_id          # add task_id assigned from remote
+
+            await self.wait_until_ready()
+            await asyncio.to_thread(self.planner._add_task_to_local, task)
+
+        return f"Task[{task_id}] added successfully!"
+
+    async def add_tasks_bulk(self, tasks):
+        await self.wait_until_ready()
+        if self.planner.write_behind is not None:
+            return await asyncio.to_thread(self.planner.add_tasks_bulk, tasks)
+
+        async def add(task):
+            return await async_notion_api.add_task_to_remote(task, self.planner.client)
+
+        with self.planner._operation():
+            result = await self._gather('added', add, tasks, [task.name for task in tasks])
+            await asyncio.to_thread(self.planner._apply_added, result, tasks)
+        return result
+
+    async def add_tasks(self, tasks):
+        return (await self.add_tasks_bulk(tasks)).summary()
+
+    # delete task
+    async def delete_task(self, task_id):
+        if self.planner.write_behind is not None:
+            await self.wait_until_ready()
+            return await asyncio.to_thread(self.planner.delete_task, task_id)      # journaled locally, no remote round-trip
+
+        with self.planner._operation():
+            try:
+                await async_notion_api.delete_task_from_remote(task_id, self.planner.client)
+            except HTTPError as e:
+                await asyncio.to_thread(self.planner._rescan_if_removed, [(task_id, e)])
+                raise
+            await self.wait_until_ready()
+            await asyncio.to_thread(self.planner._delete_task_from_local, task_id)
+
+        return f"Task[{task_id}] deleted successfully!"
+
+    async def delete_tasks_bulk(self, task_ids):
+        await self.wait_until_ready()
+        if self.planner.write_behind is not None:
+            return await asyncio.to_thread(self.planner.delete_tasks_bulk, task_ids)
+
+        async def delete(task_id):
+            await async_notion_api.delete_task_from_remote(task_id, self.planner.client)
+            return task_id
+
+        with self.planner._operation():
+            result = await self._gather('deleted', delete, task_ids, task_ids)
+            await asyncio.to_thread(self.planner._apply_deleted, result)
+            await asyncio.to_thread(self.planner._rescan_if_removed, [(item.key, item.error) for item in result.failed])
+        return result
+
+    async def delete_tasks(self, task_ids):
+        return (await self.delete_tasks_bulk(task_ids)).summary()
+
+    # edit task
+    async def edit_task(self, task_id, task):
+        if self.planner.write_behind is not None:
+            await self.wait_until_ready()
+            return await asyncio.to_thread(self.planner.edit_task, task_id, task)      # journaled locally, no remote round-trip
+
+        with self.planner._operation():
+            try:
+                await async_notion_api.edit_task_from_remote(task_id, task, self.planner.client)
+            except HTTPError as e:
+                await asyncio.to_thread(self.planner._rescan_if_removed, [(task_id, e)])
+                raise
+            await self.wait_until_ready()
+            await asyncio.to_thread(self.planner._edit_task_from_local, task_id, task)
+
+        return f"Task[{task_id}] updated successfully!"
+
+    async def edit_tasks_bulk(self, task_updates):
+        await self.wait_until_ready()
+        if self.planner.write_behind is not None:
+            return await asyncio.to_thread(self.planner.edit_tasks_bulk, task_updates)
+
+        async def edit(update):
+            task_id, task = update
+            await async_notion_api.edit_task_from_remote(task_id, task, self.planner.client)
+            return task_id
+
+        updates = list(task_updates.items())
+        with self.planner._operation():
+            result = await self._gather('updated', edit, updates, [task_id for task_id, _ in updates])
+            await asyncio.to_thread(self.planner._apply_edited, result, updates)
+            await asyncio.to_thread(self.planner._rescan_if_removed, [(item.key, item.error) for item in result.failed])
+        return result
+
+    async def edit_tasks(self, task_updates):
+        return (await self.edit_tasks_bulk(task_updates)).summary()
+
+    # get task
+    # answered from the local store once it is loaded, so they do not leave the event loop
+    async def get_task(self, task_id):
+        await self.wait_until_ready()
+        return self.planner.get_task(task_id)
+
+    async def get_task_id_by_name(self, name):
+        await self.wait_until_ready()
+        return self.planner.get_task_id_by_name(name)
+
+    async def get_tasks_by_name(self, name):
+        await self.wait_until_ready()
+        return self.planner.get_tasks_by_name(name)
+
+    async def get_tasks_by_group(self, group):
+        await self.wait_until_ready()
+        return self.planner.get_tasks_by_group(group)
+
+    async def get_tasks_after(self, when):
+        await self.wait_until_ready()
+        return self.planner.get_tasks_after(when)
+
+    async def get_tasks_between(self, start, end):
+        await self.wait_until_ready()
+        return self.planner.get_tasks_between(start, end)
+
+    async def get_tasks_overlapping(self, start, end):
+        await self.wait_until_ready()
+        return self.planner.get_tasks_overlapping(start, end)
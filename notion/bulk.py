@@ -0,0 +1,91 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+from requests.exceptions import HTTPError, RequestException
+
+
+SUCCEEDED = 'succeeded'
+RETRIED = 'retried'     # succeeded after at least one retry
+FAILED = 'failed'
+
+max_workers = int(os.getenv('NOTION_BULK_WORKERS', '8'))
+
+
+class BulkItemResult:
+    def __init__(self, key, status, task_id=None, error=None, attempts=1):
+        self.key = key              # the task_id, or the task name for additions
+        self.status = status
+        self.task_id = task_id
+        self.error = error
+        self.attempts = attempts
+
+    @property
+    def ok(self):
+        return self.status != FAILED
+
+    def __str__(self):
+        string = f"[{self.key}][{self.status}]"
+        if self.error is not None:
+            string += f" {self.error}"
+        return string
+
+
+# per-item outcomes, in the order the items were given
+class BulkResult:
+    def __init__(self, action, items):
+        self.action = action        # 'added', 'deleted' or 'updated'
+        self.items = items
+
+    @property
+    def succeeded(self):
+        return [item for item in self.items if item.ok]
+
+    @property
+    def retried(self):
+        return [item for item in self.items if item.status == RETRIED]
+
+    @property
+    def failed(self):
+        return [item for item in self.items if not item.ok]
+
+    def summary(self):
+        if not self.failed:
+            return f"{len(self.items)} Tasks {self.action} successfully!"
+
+        string = f"{len(self.succeeded)}/{len(self.items)} Tasks {self.action} successfully!"
+        string += "\nFailed:\n" + "\n".join(str(item) for item in self.failed)
+        return string
+
+    def __str__(self):
+        return self.summary()
+
+
+# only errors that may succeed on a second try are retried: network errors and 5xx responses
+def is_transient(error):
+    if isinstance(error, HTTPError):
+        return error.response is not None and error.response.status_code >= 500
+    return isinstance(error, RequestException)
+
+
+def run_bulk(action, func, items, keys, retries=1, workers=None):
+    # transient failures are retried up to `retries` times; other failures are recorded and do not stop the rest
+    def run(key, item):
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                task_id = func(item)
+            except Exception as e:
+                if attempts <= retries and is_transient(e):
+                    continue
+                return BulkItemResult(key, FAILED, error=e, attempts=attempts)
+
+            status = SUCCEEDED if attempts == 1 else RETRIED
+            return BulkItemResult(key, status, task_id=task_id, attempts=attempts)
+
+    if not items:
+        return BulkResult(action, [])
+
+    with ThreadPoolExecutor(max_workers=min(workers or max_workers, len(items))) as executor:
+        futures = [executor.submit(run, key, item) for key, item in zip(keys, items)]
+        return BulkResult(action, [future.result() for future in futures])
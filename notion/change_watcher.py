@@ -0,0 +1,117 @@
+import threading
+import time
+import weakref
+
+
+# the interval grows by `backoff` while polls find nothing; a change or a local write (`poke`) resets it
+class ChangeWatcher:
+    def __init__(self, planner, min_interval=2.0, max_interval=60.0, backoff=2.0):
+        self.planner = planner
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.interval = min_interval
+        self.last_poll = None
+        self.last_error = None
+
+        self._subscribers = []
+        self._subscribers_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._next_poll = time.monotonic() + min_interval
+        self._deadline_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            if self._thread is not threading.current_thread():     # e.g. the planner closed by the watcher's own sync
+                self._thread.join()
+            self._thread = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def poke(self):
+        # a local write often comes with other changes nearby, so poll soon and often again
+        if threading.current_thread() is self._thread:
+            return      # the watcher's own sync writing the changes it found
+        self.interval = self.min_interval
+        with self._deadline_lock:
+            # only ever brings the next poll closer, so a stream of writes cannot postpone it
+            self._next_poll = min(self._next_poll, time.monotonic() + self.min_interval)
+        self._wake.set()
+
+    # subscriptions
+    # subscribers are kept as callables returning the callback, or None once a weak one is gone
+    def subscribe(self, callback, weak=False):
+        if not weak:
+            reference = lambda: callback
+        elif hasattr(callback, '__self__'):
+            reference = weakref.WeakMethod(callback)
+        else:
+            reference = weakref.ref(callback)
+        with self._subscribers_lock:
+            self._subscribers.append(reference)
+        return callback
+
+    def unsubscribe(self, callback):
+        with self._subscribers_lock:
+            self._subscribers = [reference for reference in self._subscribers if reference() not in (callback, None)]
+
+    def _publish(self, diff):
+        with self._subscribers_lock:
+            self._subscribers = [reference for reference in self._subscribers if reference() is not None]
+            subscribers = [reference() for reference in self._subscribers]
+        for callback in subscribers:
+            if callback is None:
+                continue
+            try:
+                callback(diff)
+            except Exception as e:
+                print(f"Change subscriber failed: {e}")
+
+    # polling
+    def poll(self):
+        # the diff, or None when nothing changed
+        diff = self.planner.sync_tasks()
+        self.last_poll = time.time()
+        if not (diff['added'] or diff['updated'] or diff['removed']):
+            return None
+
+        diff['time'] = self.last_poll
+        self._publish(diff)
+        return diff
+
+    def _run(self):
+        while not self._stop.is_set():
+            with self._deadline_lock:
+                remaining = self._next_poll - time.monotonic()
+            if remaining > 0:
+                self._wake.wait(remaining)
+                self._wake.clear()
+                continue        # the deadline may have moved; a poll that is due is never skipped
+            if self._stop.is_set():
+                break
+
+            try:
+                changed = self.poll() is not None
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+                changed = False
+            if changed:
+                self.interval = self.min_interval
+            else:
+                self.interval = min(self.max_interval, self.interval * self.backoff)
+            with self._deadline_lock:
+                self._next_poll = time.monotonic() + self.interval
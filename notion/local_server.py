@@ -0,0 +1,388 @@
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+# schema of the planner database, keyed by property name like the Notion API
+default_properties = {
+    '이름': {'id': 'title', 'name': '이름', 'type': 'title', 'title': {}},
+    '날짜': {'id': 'dAtE', 'name': '날짜', 'type': 'date', 'date': {}},
+    '그룹': {'id': 'gRoP', 'name': '그룹', 'type': 'select', 'select': {'options': []}},
+}
+
+max_page_size = 100
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+
+def _parse_datetime(value):
+    if value is None:
+        return None
+    dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return dt if dt.tzinfo else dt.astimezone()
+
+
+# in-process stand-in for the parts of the Notion API the planner uses; point the client at `server.url`
+class LocalNotionServer:
+    def __init__(self, host='127.0.0.1', port=0, database_id=None,
+                 latency=0.0, jitter=0.0, rate_429=0.0, error_rate=0.0, retry_after=1,
+                 rate_limit=None, wide_columns=0, seed=None):
+        self.database_id = database_id or str(uuid.uuid4())
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.rate_limit = rate_limit
+
+        self.properties = dict(default_properties)
+        for i in range(wide_columns):
+            name = f'memo{i}'
+            self.properties[name] = {'id': f'memo{i}', 'name': name, 'type': 'rich_text', 'rich_text': {}}
+
+        self.pages = {}             # page id -> page, in creation order
+        self.request_count = 0
+        self.status_counts = {}     # status code -> number of responses
+
+        self._lock = threading.Lock()
+        self._recent_requests = []  # request times within the last second, for rate_limit
+        self._random = random.Random(seed)
+
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}/v1'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # seed a page directly, without going through HTTP
+    def add_page(self, name, start=None, end=None, group=None):
+        properties = {
+            '이름': {'title': [{'text': {'content': name}}]},
+            '날짜': {'date': {'start': start, 'end': end} if start else None},
+            '그룹': {'select': {'name': group} if group else None},
+        }
+        with self._lock:
+            return self._create_page(properties)
+
+    # -- pages
+    def _property_value(self, prop, value):
+        if prop['type'] in ('title', 'rich_text'):
+            texts = value.get(prop['type']) or []
+            return [{
+                'type': 'text',
+                'text': {'content': t.get('text', {}).get('content', t.get('plain_text', ''))},
+                'plain_text': t.get('text', {}).get('content', t.get('plain_text', ''))
+            } for t in texts]
+        if prop['type'] == 'date':
+            date = value.get('date')
+            if not date or not date.get('start'):
+                return None
+            return {'start': date['start'], 'end': date.get('end'), 'time_zone': None}
+        if prop['type'] == 'select':
+            select = value.get('select')
+            return {'id': select['name'], 'name': select['name'], 'color': 'default'} if select else None
+        return value.get(prop['type'])
+
+    def _create_page(self, properties):
+        now = _now()
+        page = {
+            'object': 'page',
+            'id': str(uuid.uuid4()),
+            'created_time': now,
+            'last_edited_time': now,
+            'archived': False,
+            'in_trash': False,
+            'parent': {'type': 'database_id', 'database_id': self.database_id},
+            'properties': {}
+        }
+        for name, prop in self.properties.items():
+            if prop['type'] == 'rich_text':
+                value = [{'type': 'text', 'text': {'content': 'x' * 200}, 'plain_text': 'x' * 200}]
+            else:
+                value = self._property_value(prop, properties.get(name, {}))
+            page['properties'][name] = {'id': prop['id'], 'type': prop['type'], prop['type']: value}
+
+        self.pages[page['id']] = page
+        return page
+
+    def _update_page(self, page, request_json):
+        for name, value in request_json.get('properties', {}).items():
+            prop = self.properties.get(name)
+            if prop is None:
+                raise LookupError(f"{name} is not a property that exists.")
+            page['properties'][name][prop['type']] = self._property_value(prop, value)
+        if 'archived' in request_json:
+            page['archived'] = page['in_trash'] = bool(request_json['archived'])
+        page['last_edited_time'] = _now()
+        return page
+
+    # -- queries
+    def _property_of(self, page, name):
+        prop = self.properties[name]
+        return prop['type'], page['properties'][name][prop['type']]
+
+    def _match_date(self, value, condition):
+        if 'is_empty' in condition:
+            return value is None
+        if 'is_not_empty' in condition:
+            return value is not None
+        if value is None:
+            return False
+        operator, operand = next(iter(condition.items()))
+        value, operand = _parse_datetime(value), _parse_datetime(operand)
+        return {
+            'equals': value == operand,
+            'before': value < operand,
+            'after': value > operand,
+            'on_or_before': value <= operand,
+            'on_or_after': value >= operand,
+        }[operator]
+
+    def _match(self, page, condition):
+        if 'and' in condition:
+            return all(self._match(page, c) for c in condition['and'])
+        if 'or' in condition:
+            return any(self._match(page, c) for c in condition['or'])
+
+        if 'timestamp' in condition:
+            timestamp = condition['timestamp']
+            return self._match_date(page[timestamp], condition[timestamp])
+
+        property_type, value = self._property_of(page, condition['property'])
+        if property_type == 'date':
+            return self._match_date(value['start'] if value else None, condition['date'])
+
+        if property_type == 'select':
+            select_condition = condition['select']
+            name = value['name'] if value else None
+            if 'equals' in select_condition:
+                return name == select_condition['equals']
+            if 'does_not_equal' in select_condition:
+                return name != select_condition['does_not_equal']
+            return (name is None) == ('is_empty' in select_condition)
+
+        text = ''.join(t['plain_text'] for t in value)
+        text_condition = condition.get(property_type) or condition.get('rich_text') or condition.get('title')
+        if 'equals' in text_condition:
+            return text == text_condition['equals']
+        if 'contains' in text_condition:
+            return text_condition['contains'] in text
+        return (text == '') == ('is_empty' in text_condition)
+
+    def _sort_key(self, sort):
+        if 'timestamp' in sort:
+            return lambda page: page[sort['timestamp']]
+
+        def key(page):
+            property_type, value = self._property_of(page, sort['property'])
+            if property_type == 'date':
+                return (value is None, value['start'] if value else '')
+            if property_type == 'select':
+                return (value is None, value['name'] if value else '')
+            return (False, ''.join(t['plain_text'] for t in value))
+        return key
+
+    def _query(self, request_json, filter_properties):
+        pages = [page for page in self.pages.values() if not page['archived']]
+        if request_json.get('filter'):
+            pages = [page for page in pages if self._match(page, request_json['filter'])]
+        for sort in reversed(request_json.get('sorts') or []):
+            pages.sort(key=self._sort_key(sort), reverse=sort.get('direction') == 'descending')
+
+        start = 0
+        cursor = request_json.get('start_cursor')
+        if cursor:
+            start = next((i for i, page in enumerate(pages) if page['id'] == cursor), len(pages))
+        size = min(int(request_json.get('page_size') or max_page_size), max_page_size)
+        results = pages[start:start + size]
+        has_more = start + size < len(pages)
+
+        if filter_properties:
+            results = [{
+                **page,
+                'properties': {
+                    name: value for name, value in page['properties'].items() if value['id'] in filter_properties
+                }
+            } for page in results]
+
+        return {
+            'object': 'list',
+            'results': results,
+            'next_cursor': pages[start + size]['id'] if has_more else None,
+            'has_more': has_more,
+            'type': 'page_or_database',
+            'page_or_database': {}
+        }
+
+    # -- http
+    def _fault(self):
+        # the injected (status, headers) for this request, if any
+        with self._lock:
+            self.request_count += 1
+            if self.rate_limit:
+                now = time.monotonic()
+                self._recent_requests = [t for t in self._recent_requests if now - t < 1.0]
+                if len(self._recent_requests) >= self.rate_limit:
+                    return 429, {'Retry-After': str(self.retry_after)}
+                self._recent_requests.append(now)
+
+            roll = self._random.random()
+            if roll < self.rate_429:
+                return 429, {'Retry-After': str(self.retry_after)}
+            if roll < self.rate_429 + self.error_rate:
+                return self._random.choice((500, 502, 503)), {}
+        return None
+
+    def handle(self, method, path, query, request_json):
+        # returns (status, body)
+        parts = [part for part in path.split('/') if part]
+        if parts[:1] != ['v1']:
+            return 404, {'object': 'error', 'code': 'invalid_request_url', 'message': 'Invalid request URL.'}
+        parts = parts[1:]
+
+        with self._lock:
+            if parts[:1] == ['databases'] and len(parts) >= 2:
+                if parts[1].replace('-', '') != self.database_id.replace('-', ''):
+                    return 404, {'object': 'error', 'code': 'object_not_found', 'message': f'Could not find database with ID: {parts[1]}.'}
+                if method == 'GET' and len(parts) == 2:
+                    return 200, {'object': 'database', 'id': self.database_id, 'properties': self.properties}
+                if method == 'POST' and parts[2:] == ['query']:
+                    filter_properties = set(query.get('filter_properties', []))
+                    return 200, self._query(request_json or {}, filter_properties)
+
+            if parts == ['pages'] and method == 'POST':
+                parent = (request_json or {}).get('parent', {})
+                if parent.get('database_id', '').replace('-', '') != self.database_id.replace('-', ''):
+                    return 404, {'object': 'error', 'code': 'object_not_found', 'message': 'Could not find the parent database.'}
+                return 200, self._create_page(request_json.get('properties', {}))
+
+            if parts[:1] == ['pages'] and len(parts) == 2:
+                page = self.pages.get(parts[1])
+                if page is None:
+                    return 404, {'object': 'error', 'code': 'object_not_found', 'message': f'Could not find page with ID: {parts[1]}.'}
+                if method == 'GET':
+                    return 200, page
+                if method == 'PATCH':
+                    if page['archived'] and (request_json or {}).get('archived') is not False:
+                        return 400, {'object': 'error', 'code': 'validation_error',
+                                     'message': "Can't edit block that is archived. You must unarchive the block before editing."}
+                    try:
+                        return 200, self._update_page(page, request_json or {})
+                    except LookupError as e:
+                        return 400, {'object': 'error', 'code': 'validation_error', 'message': str(e)}
+
+        return 400, {'object': 'error', 'code': 'invalid_request', 'message': f'Unsupported request: {method} {path}'}
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'      # keep-alive, like the real API
+
+            def log_message(self, format, *args):
+                pass
+
+            def _respond(self, status, body, headers=None):
+                data = json.dumps(body, ensure_ascii=False).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+                with server._lock:
+                    server.status_counts[status] = server.status_counts.get(status, 0) + 1
+
+            def _handle(self, method):
+                length = int(self.headers.get('Content-Length') or 0)
+                body = self.rfile.read(length) if length else b''
+
+                delay = server.latency + (server._random.uniform(0, server.jitter) if server.jitter else 0)
+                if delay:
+                    time.sleep(delay)
+
+                if not self.headers.get('Authorization', '').startswith('Bearer '):
+                    return self._respond(401, {'object': 'error', 'code': 'unauthorized', 'message': 'API token is invalid.'})
+
+                fault = server._fault()
+                if fault:
+                    status, headers = fault
+                    code = 'rate_limited' if status == 429 else 'internal_server_error'
+                    return self._respond(status, {'object': 'error', 'code': code, 'message': 'Injected failure.'}, headers)
+
+                try:
+                    request_json = json.loads(body) if body else None
+                except json.JSONDecodeError:
+                    return self._respond(400, {'object': 'error', 'code': 'invalid_json', 'message': 'Error parsing JSON body.'})
+
+                url = urlsplit(self.path)
+                status, response = server.handle(method, url.path, parse_qs(url.query), request_json)
+                self._respond(status, response)
+
+            def do_GET(self):
+                self._handle('GET')
+
+            def do_POST(self):
+                self._handle('POST')
+
+            def do_PATCH(self):
+                self._handle('PATCH')
+
+        return Handler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the Notion API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--database-id', default=None)
+    parser.add_argument('--pages', type=int, default=0, help="number of pages to seed")
+    parser.add_argument('--latency', type=float, default=0.0)
+    parser.add_argument('--jitter', type=float, default=0.0)
+    parser.add_argument('--rate-429', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--rate-limit', type=float, default=None)
+    parser.add_argument('--wide-columns', type=int, default=0)
+    args = parser.parse_args()
+
+    server = LocalNotionServer(
+        args.host, args.port, args.database_id,
+        latency=args.latency, jitter=args.jitter, rate_429=args.rate_429,
+        error_rate=args.error_rate, rate_limit=args.rate_limit, wide_columns=args.wide_columns
+    )
+    for i in range(args.pages):
+        server.add_page(f'task {i}', f'2025-01-{i % 28 + 1:02d}T09:00:00.000+09:00', None, ('일상', '이벤트')[i % 2])
+
+    print(f"NOTION_BASE_URL={server.url}")
+    print(f"NOTION_DATABASE_ID={server.database_id}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server._httpd.server_close()
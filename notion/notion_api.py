@@ -1,115 +1,293 @@
-import requests
 import json
 import datetime
+import threading
 
 import os
 from dotenv import load_dotenv
+from requests.exceptions import RequestException
 
-from notion import Task
+from notion.notion_client import NotionClient
+from notion.page_decoder import PageDecoder
+from notion.query_cache import QueryCache
 
 
-# initialize the environment variables
-load_dotenv()
-api_key = os.getenv('NOTION_API_KEY')
-database_id = os.getenv('NOTION_DATABASE_ID')
+default_base_url = 'https://api.notion.com/v1'
 
-base_url = 'https://api.notion.com/v1'
+# shared client with a pooled keep-alive session, built on first use
+_client = None
+_client_lock = threading.RLock()
 
-headers = {
-    'Authorization': 'Bearer ' + api_key,
-    'Notion-Version': '2022-06-28'
-}
+
+def default_client_options():
+    return {
+        'pool_size': int(os.getenv('NOTION_POOL_SIZE', '10')),
+        'connect_timeout': float(os.getenv('NOTION_CONNECT_TIMEOUT', '5')),
+        'read_timeout': float(os.getenv('NOTION_READ_TIMEOUT', '30')),
+        'rate_limit': float(os.getenv('NOTION_RATE_LIMIT', '3')),
+        'max_retries': int(os.getenv('NOTION_MAX_RETRIES', '5'))
+    }
+
+
+def configure(api_key=None, database_id=None, base_url=None, **client_options):
+    # values not given come from the environment and .env: NOTION_API_KEY, NOTION_DATABASE_ID, NOTION_BASE_URL
+    global _client
+
+    load_dotenv()
+    api_key = api_key or os.getenv('NOTION_API_KEY')
+    database_id = database_id or os.getenv('NOTION_DATABASE_ID')
+    base_url = base_url or os.getenv('NOTION_BASE_URL', default_base_url)
+    if not api_key:
+        raise ValueError("Missing NOTION_API_KEY in environment variables")
+
+    options = {**default_client_options(), **client_options}
+
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+        _client = NotionClient(api_key, database_id, base_url, **options)
+        query_cache.invalidate()
+        return _client
+
+
+def get_client():
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                configure()
+    return _client
+
+
+# every function below takes an optional `client`, e.g. one of a `PlannerPool`, and uses the shared one otherwise
+def _resolve(client):
+    return client if client is not None else get_client()
+
+
+def _database_id(client=None):
+    return _resolve(client).database_id
+
+
+def _namespace(client=None):
+    return _resolve(client).namespace
 
 
 # request functions
-def request_get(endpoint):
-    url = base_url + endpoint
-    response = requests.get(url, headers=headers)
-    response.raise_for_status()     # Raise an error for bad responses (4xx and 5xx)
+def request_get(endpoint, client=None):
+    return _resolve(client).get(endpoint)
 
-    return response.json()
+def request_post(endpoint, json_data, client=None):
+    return _resolve(client).post(endpoint, json_data)
 
-def request_post(endpoint, json_data):
-    url = base_url + endpoint
-    response = requests.post(url, headers={**headers, 'Content-Type': 'application/json'}, json=json_data)
-    response.raise_for_status()
 
-    return response.json()
+def request_patch(endpoint, json_data, client=None):
+    return _resolve(client).patch(endpoint, json_data)
 
 
-def request_patch(endpoint, json_data):
-    url = base_url + endpoint
-    response = requests.patch(url, headers=headers, json=json_data)
-    response.raise_for_status()
-    
-    return response.json()
+# query functions
+page_size = 100     # maximum page size allowed by the Notion API
+
+
+# savings are estimated from full responses, or from a one-page sample bytes_saved() takes; never on the load path
+class ResponseSizeCounter:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counts = {
+                'projected': {'bytes': 0, 'pages': 0},
+                'full': {'bytes': 0, 'pages': 0}
+            }
+            self.sampled_savings = []       # bytes one page is smaller when projected, per sampled database
+            self._unsampled = {}        # namespace -> (client, full endpoint, projected endpoint)
+            self._sampled = set()
+
+    def record(self, projected, num_bytes, num_pages):
+        with self._lock:
+            count = self.counts['projected' if projected else 'full']
+            count['bytes'] += num_bytes
+            count['pages'] += num_pages
+
+    def note_projection(self, client, endpoint, projected_endpoint):
+        with self._lock:
+            if client.namespace not in self._sampled:
+                self._unsampled.setdefault(client.namespace, (client, endpoint, projected_endpoint))
+
+    def _sample(self):
+        # the response envelope is the same with and without the projection and cancels out
+        with self._lock:
+            targets = list(self._unsampled.items())
+            self._unsampled.clear()
+            self._sampled.update(namespace for namespace, _ in targets)
+        for _, (client, endpoint, projected_endpoint) in targets:
+            try:
+                full = client.send('POST', endpoint, {'page_size': 1})
+                projected = client.send('POST', projected_endpoint, {'page_size': 1})
+            except RequestException as e:
+                print(f"Failed to sample the size of a projected page: {e}")
+                continue
+            if full.json()['results']:
+                with self._lock:
+                    self.sampled_savings.append(len(full.content) - len(projected.content))
+
+    def bytes_saved(self):
+        projected, full = self.counts['projected'], self.counts['full']
+        if full['pages']:
+            full_bytes_per_page = full['bytes'] / full['pages']
+            return int(full_bytes_per_page * projected['pages'] - projected['bytes'])
+        self._sample()      # two small queries per projected database, only the first time it is asked
+        if self.sampled_savings:
+            return int(sum(self.sampled_savings) / len(self.sampled_savings) * projected['pages'])
+        return None
+
+    def __str__(self):
+        projected, full = self.counts['projected'], self.counts['full']
+        string = f"projected: {projected['bytes']} bytes / {projected['pages']} pages, "
+        string += f"full: {full['bytes']} bytes / {full['pages']} pages"
+        saved = self.bytes_saved()
+        if saved is not None:
+            string += f", saved: ~{saved} bytes"
+        return string
+
+
+response_sizes = ResponseSizeCounter()
+
+
+def query_database(request_json=None, filter_properties=None, client=None):
+    # yields the raw results page by page; Notion returns only the property ids in `filter_properties`
+    client = _resolve(client)
+    endpoint = '/databases/' + client.database_id + '/query'
+    if filter_properties:
+        # property ids from the schema are already url-encoded
+        projected_endpoint = endpoint + '?' + '&'.join('filter_properties=' + property_id for property_id in filter_properties)
+        response_sizes.note_projection(client, endpoint, projected_endpoint)
+        endpoint = projected_endpoint
+
+    request_json = dict(request_json) if request_json else {}
+    request_json['page_size'] = page_size
+
+    while True:
+        raw_response = client.send('POST', endpoint, request_json)
+        response = raw_response.json()
+        response_sizes.record(bool(filter_properties), len(raw_response.content), len(response['results']))
+        yield response['results']
+
+        if not response.get('has_more'):
+            break
+        request_json['start_cursor'] = response['next_cursor']
+
+
+# page decoders, compiled once per database and token from the schema
+_decoders = {}
+_decoders_lock = threading.Lock()
+
+
+def get_database_schema(client=None):
+    return request_get('/databases/' + _database_id(client), client)
+
+
+def get_decoder(client=None):
+    namespace = _namespace(client)
+    decoder = _decoders.get(namespace)
+    if decoder is None:
+        with _decoders_lock:
+            decoder = _decoders.get(namespace)
+            if decoder is None:
+                decoder = PageDecoder(get_database_schema(client))
+                _decoders[namespace] = decoder
+    return decoder
+
+
+def invalidate_decoder(client=None):
+    # call after the database schema changed (e.g. a property was renamed)
+    _decoders.pop(_namespace(client), None)
+
+
+def _projection_ids(decoder, projection):
+    if projection is True:
+        return list(decoder.property_ids.values())     # only the properties a Task needs
+    return projection or None
+
+
+def iter_tasks(filter_condition=None, projection=True, client=None):
+    # `projection`: True for the properties Task uses, None for all of them, or a list of property ids
+    decoder = get_decoder(client)
+    request_json = {"filter": filter_condition} if filter_condition else None
+    for results in query_database(request_json, _projection_ids(decoder, projection), client):
+        yield from decoder.decode_pages(results)
+
+
+# read queries for direct callers of the functions below and of async_notion_api; the planner reads its
+# local store instead. Cached for NOTION_QUERY_CACHE_TTL seconds (0 disables), dropped on any mutation below
+query_cache = QueryCache(float(os.getenv('NOTION_QUERY_CACHE_TTL', '30')))
+
+
+def _cached_tasks(filter_condition=None, projection=True, client=None):
+    # the key is the normalized payload, so equal filters share an entry whatever their key order
+    key = json.dumps({
+        'filter': filter_condition,
+        'projection': projection
+    }, sort_keys=True, ensure_ascii=False)
+    return query_cache.get_or_load(key, lambda: list(iter_tasks(filter_condition, projection, client)),
+                                   scope=_namespace(client))     # never shared between tokens
 
 
 # functions
-def get_tasks():
-    response = request_post('/databases/' + database_id + '/query', None)       # get all tasks from the database (max 20 tasks)
-    
-    tasks = []
-    for item in response['results']:
-        properties = item['properties']
-        task_id = item['id']
-        name = properties['이름']['title'][0]['plain_text'] if properties['이름']['title'] else ''
-        start_date = properties.get('날짜', {}).get('date', {}).get('start', '')
-        end_date = properties.get('날짜', {}).get('date', {}).get('end', '')
-        date = {'start': start_date, 'end': end_date}
-        group = properties.get('그룹', {}).get('select', {}).get('name', '') if properties.get('그룹', {}).get('select') else ''
-        tasks.append(Task(task_id, name, date, group))
-    return tasks
-
-def get_tasks_by_group(group_name):
+# the returned lists may be shared through the query cache; do not modify them
+def get_tasks(projection=True, client=None):
+    return _cached_tasks(projection=projection, client=client)
+
+def get_tasks_by_group(group_name, projection=True, client=None):
     filter_condition = {
         "property": "그룹",
         "select": {
             "equals": group_name
         }
     }
-    request_json = {
-        "filter": filter_condition
-    }
-    response = request_post('/databases/' + database_id + '/query', request_json)       # get all tasks from the database (max 20 tasks)
-    
-    tasks = []
-    for item in response['results']:
-        properties = item['properties']
-        task_id = item['id']
-        name = properties['이름']['title'][0]['plain_text'] if properties['이름']['title'] else ''
-        start_date = properties.get('날짜', {}).get('date', {}).get('start', '')
-        end_date = properties.get('날짜', {}).get('date', {}).get('end', '')
-        date = {'start': start_date, 'end': end_date}
-        group = properties.get('그룹', {}).get('select', {}).get('name', '') if properties.get('그룹', {}).get('select') else ''
-        tasks.append(Task(task_id, name, date, group))
-    return tasks
-
-def get_tasks_after_now():
-    now_date = datetime.datetime.now().astimezone().isoformat()
+    return _cached_tasks(filter_condition, projection, client)
+
+def get_tasks_after_now(projection=True, client=None):
+    # rounded down to the minute, so the calls within a minute share one cache entry
+    now_date = datetime.datetime.now().astimezone().replace(second=0, microsecond=0).isoformat()
     filter_condition = {
         "property": "날짜",
         "date": {
             "on_or_after": now_date
         }
     }
-    request_json = {
-        "filter": filter_condition
+    return _cached_tasks(filter_condition, projection, client)
+
+def get_changed_tasks(since, projection=True, client=None):
+    # last_edited_time is rounded down to the minute, so pages of the minute of `since` come again; archived pages never do
+    filter_condition = {
+        "timestamp": "last_edited_time",
+        "last_edited_time": {
+            "on_or_after": since
+        }
     }
-    response = request_post('/databases/' + database_id + '/query', request_json)       # get all tasks from the database (max 20 tasks)
-    tasks = []
-    for item in response['results']:
-        properties = item['properties']
-        task_id = item['id']
-        name = properties['이름']['title'][0]['plain_text'] if properties['이름']['title'] else ''
-        start_date = properties.get('날짜', {}).get('date', {}).get('start', '')
-        end_date = properties.get('날짜', {}).get('date', {}).get('end', '')
-        date = {'start': start_date, 'end': end_date}
-        group = properties.get('그룹', {}).get('select', {}).get('name', '') if properties.get('그룹', {}).get('select') else ''
-        tasks.append(Task(task_id, name, date, group))
-    return tasks
-
-def add_task_to_remote(task):
+    return list(iter_tasks(filter_condition, projection, client))
+
+def find_created_task_ids(task, since, client=None):
+    # whether an add that failed with a timeout or a 5xx created its page anyway; not cached
+    filter_condition = {
+        "and": [
+            {"timestamp": "created_time", "created_time": {"on_or_after": since}},
+            {"property": "이름", "title": {"equals": task.name}}
+        ]
+    }
+    group = task.group or ''
+    return [found.task_id for found in iter_tasks(filter_condition, client=client)
+            if found.start == task.start and found.end == task.end and (found.group or '') == group]
+
+def get_task_ids(client=None):
+    # only the title is requested; compared with the local ids, this finds the pages removed elsewhere
+    decoder = get_decoder(client)
+    task_ids = set()
+    for results in query_database(None, [decoder.property_ids['name']], client):
+        task_ids.update(item['id'] for item in results)
+    return task_ids
+
+def add_task_to_remote(task, client=None):
     name = task.name
     date = task.date
     group = task.group
@@ -131,22 +309,28 @@ def add_task_to_remote(task):
         properties['그룹'] = {'select': {'name': group}}
     
     request_json = {
-        'parent': {'database_id': database_id},
+        'parent': {'database_id': _database_id(client)},
         'properties': properties
     }
     
-    response = request_post('/pages', request_json)
+    try:
+        response = request_post('/pages', request_json, client)
+    finally:
+        query_cache.invalidate(_namespace(client))      # even a failed request may have created the page
     task_id = response['id']
     return task_id
 
-def delete_task_from_remote(task_id):
+def delete_task_from_remote(task_id, client=None):
     endpoint = f'/pages/{task_id}'
     request_json = {'archived': True}
 
-    response = request_patch(endpoint, request_json)
+    try:
+        response = request_patch(endpoint, request_json, client)
+    finally:
+        query_cache.invalidate(_namespace(client))
     return response
 
-def edit_task_from_remote(task_id, task):
+def edit_task_from_remote(task_id, task, client=None):
     properties = {
         '이름': {
             'title': [{'text': {'content': task.name}}]
@@ -168,6 +352,9 @@ def edit_task_from_remote(task_id, task):
     }
     
     endpoint = f'/pages/{task_id}'
-    response = request_patch(endpoint, request_json)
+    try:
+        response = request_patch(endpoint, request_json, client)
+    finally:
+        query_cache.invalidate(_namespace(client))
     return response
 
@@ -0,0 +1,99 @@
+import hashlib
+import random
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from notion.rate_limiter import RateLimiter
+
+
+# pooled keep-alive session; 429s wait for Retry-After, 5xx and connection errors of idempotent requests back off and retry
+class NotionClient:
+    notion_version = '2022-06-28'
+    retry_statuses = (500, 502, 503, 504)
+
+    def __init__(self, api_key, database_id, base_url='https://api.notion.com/v1',
+                 pool_size=10, connect_timeout=5.0, read_timeout=30.0,
+                 rate_limit=3.0, max_retries=5, backoff_base=0.5, backoff_cap=30.0):
+        self.api_key = api_key
+        self.database_id = database_id
+        # keys the caches and journal, so two tokens of one database never share them; the token only enters hashed
+        self.namespace = None if database_id is None else \
+            database_id + '-' + hashlib.sha256(f'{api_key}:{database_id}'.encode('utf-8')).hexdigest()[:16]
+        self.base_url = base_url
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.rate_limiter = RateLimiter(rate=rate_limit, burst=max(1, int(rate_limit)))
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Authorization': 'Bearer ' + api_key,
+            'Notion-Version': self.notion_version,
+            'Connection': 'keep-alive'
+        })
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def send(self, method, endpoint, json_data=None):
+        url = self.base_url + endpoint
+        # a failed page creation may still have been applied, so only retry it when throttled
+        idempotent = method != 'POST' or endpoint.endswith('/query')
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                response = self.session.request(method, url, json=json_data, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if not idempotent or attempt >= self.max_retries:
+                    raise
+                time.sleep(self._backoff(attempt))
+                continue
+
+            if attempt < self.max_retries:
+                if response.status_code == 429:
+                    retry_after = self._retry_after(response)
+                    self.rate_limiter.on_throttled(retry_after)
+                    time.sleep(self._backoff(attempt, retry_after))
+                    continue
+                if idempotent and response.status_code in self.retry_statuses:
+                    time.sleep(self._backoff(attempt))
+                    continue
+            break
+
+        response.raise_for_status()     # Raise an error for bad responses (4xx and 5xx)
+        self.rate_limiter.on_success()
+
+        return response
+
+    def request(self, method, endpoint, json_data=None):
+        return self.send(method, endpoint, json_data).json()
+
+    def _retry_after(self, response):
+        try:
+            return float(response.headers.get('Retry-After'))
+        except (TypeError, ValueError):
+            return None
+
+    # full jitter backoff, never shorter than the server's Retry-After
+    def _backoff(self, attempt, retry_after=None):
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        if retry_after:
+            delay += retry_after
+        return delay
+
+    def get(self, endpoint):
+        return self.request('GET', endpoint)
+
+    def post(self, endpoint, json_data):
+        return self.request('POST', endpoint, json_data)
+
+    def patch(self, endpoint, json_data):
+        return self.request('PATCH', endpoint, json_data)
+
+    def close(self):
+        self.session.close()
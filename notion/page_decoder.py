@@ -0,0 +1,70 @@
+from notion import Task
+
+
+# each Task field is bound to a property id from the schema, so decoding a page is a few dict lookups
+class PageDecoder:
+    # property names used when the schema has several candidates of the same type
+    default_names = {
+        'name': '이름',
+        'date': '날짜',
+        'group': '그룹'
+    }
+    field_types = {
+        'name': 'title',
+        'date': 'date',
+        'group': 'select'
+    }
+
+    def __init__(self, schema):
+        self.property_ids = {}      # field -> property id
+        self.property_names = {}    # field -> property name
+
+        properties = schema['properties']
+        for field, property_type in self.field_types.items():
+            prop = properties.get(self.default_names[field])
+            if prop is None or prop['type'] != property_type:
+                prop = next((p for p in properties.values() if p['type'] == property_type), None)
+            if prop is None:
+                continue
+            self.property_ids[field] = prop['id']
+            self.property_names[field] = prop['name']
+
+        if 'name' not in self.property_ids:
+            raise ValueError("The database schema has no title property.")
+
+    @classmethod
+    def from_names(cls, names=None):
+        # without fetching the schema, assuming the default property names
+        names = {**cls.default_names, **(names or {})}
+        properties = {
+            names[field]: {'id': names[field], 'name': names[field], 'type': property_type}
+            for field, property_type in cls.field_types.items()
+        }
+        return cls({'properties': properties})
+
+    def decode(self, item):
+        return self.decode_pages((item,))[0]
+
+    def decode_pages(self, items):
+        title_key = self.property_names['name']
+        date_key = self.property_names.get('date')
+        group_key = self.property_names.get('group')
+
+        from_iso = Task.from_iso
+        tasks = []
+        append = tasks.append
+        for item in items:
+            properties = item['properties']
+
+            title = properties[title_key]['title']
+            name = title[0]['plain_text'] if len(title) == 1 else ''.join(t['plain_text'] for t in title)
+
+            date_value = properties[date_key]['date'] if date_key in properties else None
+            start, end = (date_value['start'], date_value['end']) if date_value else (None, None)
+
+            select = properties[group_key]['select'] if group_key in properties else None
+            group = select['name'] if select else ''
+
+            append(from_iso(item['id'], name, start, end, group, item.get('last_edited_time')))
+
+        return tasks
@@ -1,13 +1,45 @@
+from concurrent.futures import Future
+from contextlib import contextmanager
+from datetime import datetime
+import os
 import threading
+import time
+
+from requests.exceptions import HTTPError
 
 import notion
+from notion import bulk
+from notion.change_watcher import ChangeWatcher
+from notion.task_cache import TaskCache
+from notion.task_store import TaskStore
+from notion.write_behind import WriteBehind
+
+
+def _is_rejected(error):
+    return isinstance(error, HTTPError) and error.response is not None and error.response.status_code in (400, 404)
 
 
 class Planner:
     _instance = None
     _lock = threading.Lock()  # 클래스 수준의 Lock 객체
 
-    def __new__(cls):
+    # Notion queries never return archived pages, so deletions made elsewhere are invisible to a delta query;
+    # they are found by comparing the local ids with an id-only scan this often
+    id_scan_interval = float(os.getenv('NOTION_ID_SCAN_INTERVAL', '60'))      # seconds
+    # load the tasks on a background thread instead of blocking the constructor
+    background_load = os.getenv('NOTION_BACKGROUND_LOAD', '1') != '0'
+    # apply mutations locally and write them to Notion from a journal in the background
+    write_behind_enabled = os.getenv('NOTION_WRITE_BEHIND', '0') == '1'
+    # poll Notion for changes made elsewhere, e.g. in the Notion UI
+    watch_changes = os.getenv('NOTION_WATCH', '0') == '1'
+
+    def __new__(cls, client=None):
+        if client is not None:
+            # a planner of its own client, e.g. from a PlannerPool, is not the shared singleton
+            instance = super().__new__(cls)
+            instance._initialized = False
+            return instance
+
         if cls._instance is None:
             with cls._lock:
                 if cls._instance is None:   # 이중 잠금 확인
@@ -15,100 +47,628 @@ class Planner:
             cls._instance._initialized = False
         return cls._instance
 
-    def __init__(self):
+    def __init__(self, client=None):
         if self._initialized:
             return
         
-        self.task_list = []
-        self.load_tasks()   # Load tasks from remote on initialization
+        self.client = client        # None for the shared client of notion_api
+        # readers use the current store as an immutable snapshot; writers copy it, change the copy
+        # and publish it under _write_lock, so reads never wait for writes
+        self.store = TaskStore()
+        self._write_lock = threading.RLock()
+        self._working = None        # the copy being changed by the thread holding _write_lock
+        # fetches from Notion run one at a time outside _write_lock; the ids written locally meanwhile
+        # are collected in _touched, and keep their local state when the fetched tasks are merged
+        self._sync_lock = threading.RLock()
+        self._touched = None
+        self.high_water_mark = None     # latest last_edited_time seen in a sync
+        self.last_full_sync = None
+        self.last_id_scan = None
+        self.drift_detected = False     # the local tasks may disagree with remote in a way a delta cannot fix
+        # operations in flight; a closed planner refuses new ones and shuts down once the last one ends
+        self._operations = threading.Condition()
+        self._active = 0
+        self._closed = False
+        self._close_client = False
+        self.cache = TaskCache.for_database(self.namespace)
+        self.write_behind = self._open_write_behind() if self.write_behind_enabled else None
+
+        self.watcher = None
+        self._ready = None          # Future resolved once the tasks are loaded
+        self._ready_lock = threading.Lock()
+        self._start_loader()
+        if not self.background_load:
+            self.wait_until_ready()
+        if self.watch_changes:
+            self.start_watcher()
 
         self._initialized = True
 
+    @property
+    def database_id(self):
+        return (self.client if self.client is not None else notion.notion_api.get_client()).database_id
+
+    @property
+    def namespace(self):
+        # the token and the database; what is kept per planner must not be shared by two tokens
+        return (self.client if self.client is not None else notion.notion_api.get_client()).namespace
+
+    def _journal_path(self):
+        path = os.getenv('NOTION_JOURNAL_PATH')
+        if path and self.client is None:    # one file can only back the shared planner
+            return path
+        directory = os.getenv('NOTION_CACHE_DIR') or '.notion_cache'
+        return os.path.join(directory, f'{self.namespace}.journal.jsonl')
+
+    def _open_write_behind(self):
+        return WriteBehind(self, self._journal_path(), interval=float(os.getenv('NOTION_FLUSH_INTERVAL', '1.0')))
+
+    @contextmanager
+    def _operation(self):
+        # raises RuntimeError once the planner is closed
+        with self._operations:
+            if self._closed:
+                raise RuntimeError("Planner is closed (e.g. evicted from a PlannerPool); get a new one.")
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._operations:
+                self._active -= 1
+                shutdown = self._closed and self._active == 0
+            if shutdown:
+                self._shutdown()
+
+    # bootstrap
+    def _start_loader(self):
+        self._ready = Future()
+        threading.Thread(target=self._bootstrap, args=(self._ready,), daemon=True).start()
+
+    def _bootstrap(self, ready):
+        try:
+            from_cache = self._load_from_cache()
+            if not from_cache:
+                self.load_tasks()   # Load tasks from remote on initialization
+        except Exception as e:
+            ready.set_exception(e)
+            return
+
+        ready.set_result(True)
+        if from_cache:
+            # serve the cached tasks right away and reconcile with remote afterwards
+            self._reconcile()
+
+    @property
+    def status(self):
+        # 'loading', 'ready' or 'failed'
+        if not self._ready.done():
+            return 'loading'
+        return 'failed' if self._ready.exception() is not None else 'ready'
+
+    def is_ready(self):
+        return self.status == 'ready'
+
+    def wait_until_ready(self, timeout=None):
+        # raises the load error; a failed load is started again on the next call
+        with self._ready_lock:
+            if self._ready.done() and self._ready.exception() is not None:
+                self._start_loader()
+            ready = self._ready
+        ready.result(timeout)
+
+    def _load_from_cache(self):
+        if self.cache is None:
+            return False
+        last_full_sync = self.cache.get_meta('last_full_sync')
+        if last_full_sync is None:     # never synced
+            return False
 
-    def load_tasks(self):
-        self.task_list = notion.get_tasks()
+        store = TaskStore(self.cache.load_tasks())
+        with self._write_lock:
+            self._reapply_pending(store)
+            self.store = store
+            self.high_water_mark = self.cache.get_meta('high_water_mark')
+            self.last_full_sync = float(last_full_sync)
+        return True
+
+    def _save_sync_state(self):
+        if self.cache is not None:
+            self.cache.set_meta(high_water_mark=self.high_water_mark, last_full_sync=self.last_full_sync)
 
-    def show_tasks(self):
-        return "\n".join(str(task) for task in self.task_list)
+    def _reconcile(self):
+        try:
+            self.sync_tasks()
+        except Exception as e:
+            print(f"Failed to reconcile cached tasks with Notion: {e}")
+
+
+    def load_tasks(self):
+        with self._operation():
+            self._load_tasks()
+
+    def _load_tasks(self):
+        # scans outside the writer lock; readers keep the old store until the new one is published
+        with self._sync_lock, self._fetching():
+            drift, self.drift_detected = self.drift_detected, False     # a drift found during the scan is kept
+            try:
+                store = TaskStore()
+                high_water_mark = None
+                for task in notion.iter_tasks(client=self.client):
+                    store.add(task)
+                    if task.last_edited_time and (high_water_mark is None or task.last_edited_time > high_water_mark):
+                        high_water_mark = task.last_edited_time
+            except BaseException:
+                self.drift_detected = self.drift_detected or drift
+                raise
+
+            with self._write_lock:
+                # the scan may predate the local writes made during it
+                for task_id in self._touched:
+                    store.remove(task_id)
+                    task = self.store.get(task_id)
+                    if task is not None:
+                        store.add(task)
+                self._reapply_pending(store)
+                old_store, self.store = self.store, store
+                self.high_water_mark = high_water_mark
+                self.last_full_sync = self.last_id_scan = time.time()
+
+                if self.cache is not None:
+                    self.cache.save_tasks(store)
+                    self._save_sync_state()
+        return old_store
+
+    @contextmanager
+    def _fetching(self):
+        with self._write_lock:
+            self._touched = set()
+        try:
+            yield
+        finally:
+            with self._write_lock:
+                self._touched = None
+
+    def _touch(self, *task_ids):
+        # called under _write_lock by every local write
+        if self._touched is not None:
+            self._touched.update(task_ids)
+
+    def _reapply_pending(self, store):
+        # remote does not reflect the journaled mutations yet, so the local state keeps them
+        if self.write_behind is not None:
+            self.write_behind.reapply(store)
+
+    @contextmanager
+    def _write(self):
+        # yields a private copy of the store, published on exit; nested blocks of one thread share it
+        with self._write_lock:
+            if self._working is not None:
+                yield self._working
+                return
+
+            self._working = self.store.copy()
+            try:
+                yield self._working
+            finally:
+                # the copy is consistent after every single change, and the cache already has them
+                self.store, self._working = self._working, None
+
+    def _needs_full_sync(self):
+        return self.drift_detected or self.high_water_mark is None or self.last_full_sync is None
+
+    def _needs_id_scan(self):
+        return self.last_id_scan is None or time.time() - self.last_id_scan > self.id_scan_interval
+
+    def _full_sync(self):
+        old_store = self._load_tasks()
+        old_tasks = {task.task_id: task for task in old_store}
+        new_tasks = {task.task_id: task for task in self.store}
+
+        return {
+            'full': True,
+            'added': [task_id for task_id in new_tasks if task_id not in old_tasks],
+            'updated': [task_id for task_id, task in new_tasks.items()
+                        if task_id in old_tasks and str(task) != str(old_tasks[task_id])],
+            'removed': [task_id for task_id in old_tasks if task_id not in new_tasks]
+        }
+
+    def sync_tasks(self, full=False):
+        # pages removed elsewhere are only dropped by the id scan, every id_scan_interval or after a rejected write
+        with self._operation():
+            self.wait_until_ready()
+            with self._sync_lock:       # one sync at a time; local writes only wait for its merge
+                return self._sync_tasks(full)
+
+    def _sync_tasks(self, full):
+        if full or self._needs_full_sync():
+            return self._full_sync()
+
+        try:
+            with self._fetching():
+                # ids first: a page created after the scan then comes with the delta instead of looking deleted
+                remote_ids = notion.get_task_ids(client=self.client) if self._needs_id_scan() else None
+                changed_tasks = notion.get_changed_tasks(self.high_water_mark, client=self.client)
+                with self._write():
+                    result = self._merge_changes(changed_tasks, remote_ids)
+        except HTTPError as e:
+            if e.response is None or e.response.status_code != 400:
+                raise
+            notion.notion_api.invalidate_decoder(self.client)      # e.g. the schema changed under the cached decoder
+            return self._full_sync()
+
+        self._save_sync_state()
+        return result
+
+    def _merge_changes(self, changed_tasks, remote_ids=None):
+        # ids written locally during the fetch, or journaled and not flushed yet, keep their local state
+        pending_ids = set(self._touched)
+        if self.write_behind is not None:
+            pending_ids |= self.write_behind.pending_ids()
+        result = {'full': False, 'added': [], 'updated': [], 'removed': []}
+        for task in changed_tasks:
+            if task.last_edited_time and task.last_edited_time > self.high_water_mark:
+                self.high_water_mark = task.last_edited_time
+            if task.task_id in pending_ids:     # the local change is newer than the remote page
+                continue
+            local_task = self._working.get(task.task_id)
+            if local_task is None:
+                self._add_task_to_local(task)
+                result['added'].append(task.task_id)
+            elif str(local_task) != str(task):     # pages edited in the last synced minute come back unchanged
+                self._edit_task_from_local(task.task_id, task)
+                result['updated'].append(task.task_id)
+
+        if remote_ids is not None:
+            self._merge_ids(remote_ids, {task.task_id for task in changed_tasks} | pending_ids, result)
+        return result
+
+    def _rescan_if_removed(self, failures):
+        # Notion answers a write to a page removed elsewhere with 404, or 400 once it is archived;
+        # scan the ids now so the page stops being listed, instead of after id_scan_interval
+        if not any(_is_rejected(error) and self.store.get(task_id) is not None for task_id, error in failures):
+            return
+        self.last_id_scan = None
+        try:
+            self.sync_tasks()
+        except Exception as e:      # the next sync still scans; the caller gets the write's own error
+            print(f"Failed to sync after a rejected write: {e}")
+
+    def _merge_ids(self, remote_ids, skipped_ids, result):
+        # pages archived or deleted elsewhere; ids of the delta, of local writes and of unflushed adds stay
+        for task in list(self._working):
+            if task.task_id not in remote_ids and task.task_id not in skipped_ids:
+                self._delete_task_from_local(task.task_id)
+                result['removed'].append(task.task_id)
+        if any(task_id not in self._working and task_id not in skipped_ids for task_id in remote_ids):
+            self.drift_detected = True      # a page the delta query missed; the next sync loads everything
+        self.last_id_scan = time.time()
+
+    def show_tasks(self, limit=None, offset=0, group=None, start=None, end=None):
+        # rows come from the store's render cache, so a page costs O(limit)
+        self.wait_until_ready()
+        store = self.store      # one snapshot for the whole rendering
+        if limit is None and offset == 0 and group is None and start is None and end is None:
+            return store.render(store)
+
+        task_list, total = store.page(limit, offset, group, start, end)
+        if not task_list:
+            return "No tasks found."
+        string = store.render(task_list)
+        if len(task_list) < total:
+            string += f"\n({offset + 1}-{offset + len(task_list)} of {total} tasks)"
+        return string
     
+    # answered from the local indexes, without a remote query
     def show_tasks_by_group(self, group):
-        task_list = notion.get_tasks_by_group(group)
-        return "\n".join(str(task) for task in task_list) if task_list else "No tasks found in this group."
+        task_list = self.get_tasks_by_group(group)
+        return self.store.render(task_list) if task_list else "No tasks found in this group."
 
     def show_tasks_after_now(self):
-        task_list = notion.get_tasks_after_now()
-        return "\n".join(str(task) for task in task_list) if task_list else "No tasks found after now."
+        task_list = self.get_tasks_after(datetime.now().astimezone())
+        return self.store.render(task_list) if task_list else "No tasks found after now."
+
+    def show_tasks_between(self, start, end):
+        task_list = self.get_tasks_between(start, end)
+        return self.store.render(task_list) if task_list else "No tasks found in this period."
+
+    # change feed
+    def start_watcher(self, **options):
+        # `options` go to ChangeWatcher when it is created
+        return self._get_watcher(**options).start()
+
+    def _get_watcher(self, **options):
+        if self.watcher is None:
+            self.watcher = ChangeWatcher(self, **options)
+        return self.watcher
+
+    def stop_watcher(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+
+    def subscribe(self, callback, weak=False):
+        # does not start the watcher; a weak subscription ends when the callback is garbage collected
+        return self._get_watcher().subscribe(callback, weak)
+
+    def unsubscribe(self, callback):
+        if self.watcher is not None:
+            self.watcher.unsubscribe(callback)
+
+    def _local_write(self):
+        if self.watcher is not None:
+            self.watcher.poke()
 
     # add task
     def _add_task_to_local(self, task):
-        self.task_list.append(task)
+        self.wait_until_ready()
+        with self._write() as store:
+            store.add(task)
+            self._touch(task.task_id)
+            if self.cache is not None:
+                self.cache.upsert_task(task)
+        self._local_write()
 
     def add_task(self, task):
-        task_id = notion.add_task_to_remote(task)
-        task.task_id = task_id          # add task_id assigned from remote
+        with self._operation():
+            if self.write_behind is not None:
+                task_id = self._add_task_write_behind(task)
+                return f"Task[{task_id}] added successfully!"
+
+            task_id = notion.add_task_to_remote(task, client=self.client)
+            task.task_id = task_id          # add task_id assigned from remote
 
-        self._add_task_to_local(task)    # update task_list in local
+            self._add_task_to_local(task)    # update the local store
 
         return f"Task[{task_id}] added successfully!"
 
-    def add_tasks(self, tasks):
-        for task in tasks:
-            self.add_task(task)  # Use the existing add_task method for each task
+    def _add_task_write_behind(self, task):
+        # the task gets a temporary id until the flusher creates the page
+        with self.write_behind.lock:
+            task.task_id = self.write_behind.record_add(task)
+            self._add_task_to_local(task)
+        return task.task_id
+
+    def add_tasks_bulk(self, tasks):
+        with self._operation():
+            if self.write_behind is not None:
+                return self._run_write_behind('added', self._add_task_write_behind, tasks, [task.name for task in tasks])
+
+            def add(task):
+                return notion.add_task_to_remote(task, client=self.client)
+
+            # page creation is not idempotent, so failed additions are never retried
+            result = bulk.run_bulk('added', add, tasks, [task.name for task in tasks], retries=0)
+            self._apply_added(result, tasks)
+            return result
+
+    # the bulk results are applied in one write, so the store is copied once per bulk instead of once per item
+    def _apply_added(self, result, tasks):
+        self.wait_until_ready()
+        with self._write():
+            for item, task in zip(result.items, tasks):
+                if item.ok:
+                    task.task_id = item.task_id
+                    self._add_task_to_local(task)
+                elif bulk.is_transient(item.error):
+                    self.drift_detected = True      # the page may have been created anyway
 
-        return f"{len(tasks)} Tasks added successfully!"
+    def add_tasks(self, tasks):
+        return self.add_tasks_bulk(tasks).summary()
 
 
     # delete task
     def _delete_task_from_local(self, task_id):
-        self.task_list = [t for t in self.task_list if t.task_id != task_id]
+        self.wait_until_ready()
+        with self._write() as store:
+            store.remove(task_id)
+            self._touch(task_id)
+            if self.cache is not None:
+                self.cache.delete_task(task_id)
+        self._local_write()
 
     def delete_task(self, task_id):
-        notion.delete_task_from_remote(task_id)
-        self._delete_task_from_local(task_id)
+        with self._operation():
+            if self.write_behind is not None:
+                task_id = self._delete_task_write_behind(task_id)
+                return f"Task[{task_id}] deleted successfully!"
+
+            try:
+                notion.delete_task_from_remote(task_id, client=self.client)
+            except HTTPError as e:
+                self._rescan_if_removed([(task_id, e)])
+                raise
+            self._delete_task_from_local(task_id)
 
         return f"Task[{task_id}] deleted successfully!"
+
+    def _delete_task_write_behind(self, task_id):
+        with self.write_behind.lock:
+            task_id = self.write_behind.record_delete(task_id)
+            self._delete_task_from_local(task_id)
+        return task_id
     
-    def delete_tasks(self, task_ids):
-        for task_id in task_ids:
-            self.delete_task(task_id)
+    def delete_tasks_bulk(self, task_ids):
+        with self._operation():
+            if self.write_behind is not None:
+                return self._run_write_behind('deleted', self._delete_task_write_behind, task_ids, task_ids)
+
+            def delete(task_id):
+                notion.delete_task_from_remote(task_id, client=self.client)
+                return task_id
+
+            result = bulk.run_bulk('deleted', delete, task_ids, task_ids)
+            self._apply_deleted(result)
+            self._rescan_if_removed([(item.key, item.error) for item in result.failed])
+            return result
+
+    def _apply_deleted(self, result):
+        self.wait_until_ready()
+        with self._write():
+            for item in result.succeeded:
+                self._delete_task_from_local(item.task_id)
 
-        return f"{len(task_ids)} Tasks deleted successfully!"
+    def delete_tasks(self, task_ids):
+        return self.delete_tasks_bulk(task_ids).summary()
 
 
     # edit task
     def _edit_task_from_local(self, task_id, task):
-        for t in self.task_list:
-            if t.task_id == task_id:
-                t.name = task.name
-                t.date = task.date
-                t.group = task.group
-                break
+        self.wait_until_ready()
+        with self._write() as store:
+            stored = store.update(task_id, task)
+            self._touch(task_id)
+            if stored is not None and self.cache is not None:
+                self.cache.upsert_task(stored)
+        self._local_write()
 
     def edit_task(self, task_id, task):
-        notion.edit_task_from_remote(task_id, task)
-        self._edit_task_from_local(task_id, task)
+        with self._operation():
+            if self.write_behind is not None:
+                task_id = self._edit_task_write_behind((task_id, task))
+                return f"Task[{task_id}] updated successfully!"
+
+            try:
+                notion.edit_task_from_remote(task_id, task, client=self.client)
+            except HTTPError as e:
+                self._rescan_if_removed([(task_id, e)])
+                raise
+            self._edit_task_from_local(task_id, task)
 
         return f"Task[{task_id}] updated successfully!"
+
+    def _edit_task_write_behind(self, update):
+        task_id, task = update
+        with self.write_behind.lock:
+            task_id = self.write_behind.record_edit(task_id, task)
+            self._edit_task_from_local(task_id, task)
+        return task_id
     
+    def edit_tasks_bulk(self, task_updates):
+        updates = list(task_updates.items())
+        with self._operation():
+            if self.write_behind is not None:
+                return self._run_write_behind('updated', self._edit_task_write_behind, updates, [task_id for task_id, _ in updates])
+
+            def edit(update):
+                task_id, task = update
+                notion.edit_task_from_remote(task_id, task, client=self.client)
+                return task_id
+
+            result = bulk.run_bulk('updated', edit, updates, [task_id for task_id, _ in updates])
+            self._apply_edited(result, updates)
+            self._rescan_if_removed([(item.key, item.error) for item in result.failed])
+            return result
+
+    def _apply_edited(self, result, updates):
+        self.wait_until_ready()
+        with self._write():
+            for item, (task_id, task) in zip(result.items, updates):
+                if item.ok:
+                    self._edit_task_from_local(task_id, task)
+
     def edit_tasks(self, task_updates):
-        for task_id, task in task_updates.items():
-            self.edit_task(task_id, task)
+        return self.edit_tasks_bulk(task_updates).summary()
+
+
+    # write-behind
+    def _run_write_behind(self, action, func, items, keys):
+        # journaling is local, so the items run in order on the calling thread, all in one write;
+        # the journal lock is taken first, in the same order as the flusher takes both
+        self.wait_until_ready()
+        results = []
+        with self.write_behind.lock, self._write():
+            for key, item in zip(keys, items):
+                try:
+                    results.append(bulk.BulkItemResult(key, bulk.SUCCEEDED, task_id=func(item)))
+                except Exception as e:
+                    results.append(bulk.BulkItemResult(key, bulk.FAILED, error=e))
+        return bulk.BulkResult(action, results)
+
+    def _replace_task_id(self, old_id, new_id):
+        # called by the flusher once a task added under a temporary id exists in Notion
+        with self._write() as store:
+            task = store.replace_id(old_id, new_id)
+            self._touch(old_id, new_id)
+            if task is not None and self.cache is not None:
+                self.cache.delete_task(old_id)
+                self.cache.upsert_task(task)
+
+    def close(self, close_client=False):
+        # operations in flight finish first and the last one shuts down; new ones raise RuntimeError
+        with self._operations:
+            if self._closed:
+                return
+            self._closed = True
+            self._close_client = close_client
+            shutdown = self._active == 0
+        if shutdown:
+            self._shutdown()
+
+    def _shutdown(self):
+        self.stop_watcher()
+        if self.write_behind is not None:
+            self.write_behind.stop()
+        if self.cache is not None:
+            self.cache.close()
+        if self._close_client and self.client is not None:
+            self.client.close()
+
+    def flush(self):
+        # True when some mutations are left for a retry
+        if self.write_behind is None:
+            return False
+        with self._operation():
+            return self.write_behind.flush()
 
-        return f"{len(task_updates)} Tasks updated successfully!"
+    def write_errors(self):
+        # for the console and the UI: mutations the flusher dropped since the last call, and why the rest wait
+        if self.write_behind is None:
+            return []
+        messages = self.write_behind.take_dropped()
+        if self.write_behind.last_error is not None:
+            messages.append(f"{self.write_behind.pending_count()} changes not written to Notion yet: {self.write_behind.last_error}")
+        return messages
 
 
     # get task
+    @property
+    def task_list(self):
+        self.wait_until_ready()
+        return list(self.store)
+
+    def get_task(self, task_id):
+        self.wait_until_ready()
+        if self.write_behind is not None:
+            task_id = self.write_behind.resolve(task_id)     # a temporary id keeps working after the flush
+        return self.store.get(task_id)
+
     def get_task_id_by_name(self, name):
-        for t in self.task_list:
-            if t.name == name:
-                return t.task_id
-            
-        return None
+        self.wait_until_ready()
+        return self.store.first_id_by_name(name)
+
+    def get_tasks_by_name(self, name):
+        self.wait_until_ready()
+        return self.store.find_by_name(name)
+
+    def get_tasks_by_group(self, group):
+        self.wait_until_ready()
+        return self.store.find_by_group(group)
+
+    def get_tasks_after(self, when):
+        self.wait_until_ready()
+        return self.store.find_after(when)
+
+    def get_tasks_between(self, start, end):
+        self.wait_until_ready()
+        return self.store.find_between(start, end)
+
+    def get_tasks_overlapping(self, start, end):
+        self.wait_until_ready()
+        return self.store.find_overlapping(start, end)
 
 
 class ConfirmablePlanner(Planner):
-    def __init__(self):
-        super().__init__()
+    def __init__(self, client=None):
+        super().__init__(client)
 
     def confirm(self, action_name, action_info):
         print(f"Action[{action_name}] has been requested.")
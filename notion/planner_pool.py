@@ -0,0 +1,94 @@
+from collections import OrderedDict
+import os
+import threading
+
+from dotenv import load_dotenv
+
+from notion import notion_api
+from notion.notion_client import NotionClient
+from notion.planner import Planner
+
+
+# one planner per (token, database_id); the least recently used are closed past `memory_budget` or `max_planners`
+class PlannerPool:
+    # measured with tracemalloc: a task with its indexes and rendered row takes about 830 bytes
+    bytes_per_task = 1024
+    bytes_per_planner = 64 * 1024      # client session, cache connection, threads
+
+    def __init__(self, memory_budget=None, max_planners=None, base_url=None, **client_options):
+        load_dotenv()
+        if memory_budget is None:
+            memory_budget = int(float(os.getenv('NOTION_POOL_MEMORY_MB', '256')) * 1024 * 1024)
+        self.memory_budget = memory_budget
+        self.max_planners = max_planners
+        self.base_url = base_url or os.getenv('NOTION_BASE_URL', notion_api.default_base_url)
+        self.client_options = {**notion_api.default_client_options(), **client_options}
+
+        self._planners = OrderedDict()      # (token, database_id) -> Planner, least recently used first
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, token, database_id):
+        key = (token, database_id)
+        with self._lock:
+            planner = self._planners.get(key)
+            if planner is None:
+                client = NotionClient(token, database_id, self.base_url, **self.client_options)
+                planner = self._planners[key] = Planner(client)     # loads in the background
+            else:
+                self._planners.move_to_end(key)
+            evicted = self._select_evictions(key)
+
+        for evicted_planner in evicted:
+            self._close(evicted_planner)
+        return planner
+
+    def _estimate(self, planner):
+        return self.bytes_per_planner + len(planner.store) * self.bytes_per_task
+
+    def memory_usage(self):
+        with self._lock:
+            return sum(self._estimate(planner) for planner in self._planners.values())
+
+    def _select_evictions(self, keep):
+        evicted = []
+        usage = sum(self._estimate(planner) for planner in self._planners.values())
+        for key in list(self._planners):
+            over_count = self.max_planners is not None and len(self._planners) > self.max_planners
+            if not over_count and usage <= self.memory_budget:
+                break
+            if key == keep:
+                continue
+            planner = self._planners.pop(key)
+            usage -= self._estimate(planner)
+            evicted.append(planner)
+        self.evictions += len(evicted)
+        return evicted
+
+    @staticmethod
+    def _close(planner):
+        # outside the pool lock: closing flushes pending writes and joins the planner's threads
+        planner.close(close_client=True)
+
+    def evict(self, token, database_id):
+        with self._lock:
+            planner = self._planners.pop((token, database_id), None)
+        if planner is not None:
+            self._close(planner)
+
+    def close(self):
+        with self._lock:
+            planners = list(self._planners.values())
+            self._planners.clear()
+        for planner in planners:
+            self._close(planner)
+
+    def __len__(self):
+        return len(self._planners)
+
+    def __contains__(self, key):
+        return key in self._planners
+
+    def keys(self):
+        with self._lock:
+            return list(self._planners)
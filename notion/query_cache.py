@@ -0,0 +1,57 @@
+from concurrent.futures import Future
+import threading
+import time
+
+
+# read-through cache of remote query results with a TTL, for callers of notion_api's get_tasks* functions;
+# concurrent misses of a key share one call, and a call that was in flight during an invalidate is not cached
+class QueryCache:
+    def __init__(self, ttl=30.0):
+        self.ttl = ttl      # seconds; 0 disables caching, concurrent calls are still coalesced
+        self._lock = threading.Lock()
+        self._entries = {}      # (scope, key) -> (expires_at, value)
+        self._inflight = {}     # (scope, key) -> Future of the running call
+        self._generations = {}  # scope -> number of invalidations, None for all scopes
+
+    def _generation(self, scope):
+        return self._generations.get(None, 0), self._generations.get(scope, 0)
+
+    def get_or_load(self, key, load, scope=None):
+        key = (scope, key)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                return entry[1]
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+                generation = self._generation(scope)
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = load()
+        except BaseException as e:
+            with self._lock:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            if self._inflight.get(key) is future:       # after an invalidate the key may belong to a newer call
+                del self._inflight[key]
+            if self.ttl > 0 and generation == self._generation(scope):
+                self._entries[key] = (time.monotonic() + self.ttl, value)
+        future.set_result(value)
+        return value
+
+    def invalidate(self, scope=None):
+        # drops the entries of `scope`, or of every scope when it is None
+        with self._lock:
+            for index in (self._entries, self._inflight):
+                for key in [key for key in index if scope is None or key[0] == scope]:
+                    del index[key]
+            self._generations[scope] = self._generations.get(scope, 0) + 1
@@ -0,0 +1,60 @@
+import threading
+import time
+
+
+# a 429 lowers the rate and remembers a ceiling below it; successes climb back to the ceiling fast, then probe slowly
+class RateLimiter:
+    def __init__(self, rate=3.0, burst=3, min_rate=0.5, decrease=0.75, increase=0.1, probe=0.001):
+        self.max_rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.rate = rate
+        self.ceiling = rate         # highest rate not known to be throttled
+        self.burst = burst
+        self.decrease = decrease
+        self.increase = increase
+        self.probe = probe
+
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        # nothing accumulates while blocked, or the end of a Retry-After would release a burst
+        elapsed = now - max(self._updated, self._blocked_until)
+        if elapsed > 0:
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    # block until a request may be sent
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def on_success(self):
+        with self._lock:
+            if self.rate < self.ceiling:
+                self.rate = min(self.ceiling, self.rate + self.increase * self.max_rate)
+            else:
+                self.rate = self.ceiling = min(self.max_rate, self.rate + self.probe * self.max_rate)
+
+    def on_throttled(self, retry_after=None):
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now >= self._blocked_until:      # the requests in flight during one throttle count once
+                self.ceiling = max(self.min_rate, min(self.ceiling, self.rate) * 0.9)
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+            self._tokens = 0.0
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
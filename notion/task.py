@@ -1,40 +1,91 @@
 from datetime import datetime
 
 
+def _to_timestamp(value):
+    if value is None or value == '' or value == "None":
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(value)
+    return int(value.timestamp())     # naive datetimes are taken as local time, as astimezone() does
+
+
+def _to_datetime(timestamp):
+    return datetime.fromtimestamp(timestamp).astimezone() if timestamp is not None else None
+
+
 class Task:
+    # no per-instance __dict__; start/end are epoch seconds, or the ISO string they are parsed from on first use
+    __slots__ = ('task_id', 'name', 'group', 'description', 'last_edited_time', '_start', '_end')
+
     def __init__(self, task_id, name, date, group):
         self.task_id = task_id
         self.name = name
+        self.date = date    # parsed right away, so a bad date raises ValueError here
+        self.group = group
+        self.description = None
+        self.last_edited_time = None    # set when decoded from a Notion page
+
+    @classmethod
+    def from_iso(cls, task_id, name, start, end, group, last_edited_time=None):
+        # trusted ISO strings, e.g. from a Notion page; the dates are parsed on first use
+        task = cls.__new__(cls)
+        task.task_id = task_id
+        task.name = name
+        task._start = start or None
+        task._end = end or None
+        task.group = group
+        task.description = None
+        task.last_edited_time = last_edited_time
+        return task
+
+    @property
+    def start_timestamp(self):
+        start = self._start
+        if start.__class__ is str:
+            start = self._start = _to_timestamp(start)
+        return start
+
+    @property
+    def end_timestamp(self):
+        end = self._end
+        if end.__class__ is str:
+            end = self._end = _to_timestamp(end)
+        return end
 
+    @property
+    def start(self):
+        return _to_datetime(self.start_timestamp)
+
+    @property
+    def end(self):
+        return _to_datetime(self.end_timestamp)
+
+    @property
+    def date(self):
+        return {
+            'start': self.start,
+            'end': self.end
+        }
+
+    @date.setter
+    def date(self, date):
         if isinstance(date, str):
             date = {
                 'start': date,
                 'end': None
             }
-        
-        date['start'] = None if date['start'] == "None" else date['start']
-        date['end'] = None if date['end'] == "None" else date['end']
-
-        self.date = {
-            'start': date.get('start', None) if isinstance(date.get('start'), datetime) else datetime.fromisoformat(date.get('start')) if date.get('start') else None,
-            'end': date.get('end', None) if isinstance(date.get('end'), datetime) else datetime.fromisoformat(date.get('end')) if date.get('end') else None
-        }
 
-        if self.date['start']:
-            self.date['start'] = self.date['start'].astimezone()
-        if self.date['end']:
-            self.date['end'] = self.date['end'].astimezone()
-
-        self.group = group
-        self.description = None
+        self._start = _to_timestamp(date.get('start'))
+        self._end = _to_timestamp(date.get('end'))
 
     def __str__(self):
-        date_string = f"{self.date['start'].strftime('%Y-%m-%d %H:%M')}" if self.date['start'] else ''
-        if self.date['end']:
-            date_string += f" ~ {self.date['end'].strftime('%Y-%m-%d %H:%M')}"
-        
+        start, end = self.start, self.end
+        date_string = f"{start.strftime('%Y-%m-%d %H:%M')}" if start else ''
+        if end:
+            date_string += f" ~ {end.strftime('%Y-%m-%d %H:%M')}"
+
         # not to confuse with the group name empty
         group_string = f"{self.group}" if self.group else ''
 
         string = f"[{self.task_id}][{self.name}][{date_string}][{group_string}]"
-        return string
\ No newline at end of file
+        return string
@@ -0,0 +1,105 @@
+import os
+import sqlite3
+import threading
+
+from notion import Task
+
+
+# SQLite in WAL mode, so a new process serves the tasks from disk while the planner syncs
+class TaskCache:
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.executescript('''
+            CREATE TABLE IF NOT EXISTS tasks (
+                position INTEGER PRIMARY KEY AUTOINCREMENT,
+                task_id TEXT UNIQUE NOT NULL,
+                name TEXT,
+                start TEXT,
+                end TEXT,
+                task_group TEXT,
+                last_edited_time TEXT
+            );
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            );
+        ''')
+        self._connection.commit()
+
+    @classmethod
+    def for_database(cls, namespace, directory=None):
+        # None when NOTION_CACHE_DIR is set empty, which disables the cache
+        directory = os.getenv('NOTION_CACHE_DIR', '.notion_cache') if directory is None else directory
+        if not directory or not namespace:
+            return None
+        return cls(os.path.join(directory, f'{namespace}.sqlite3'))
+
+    @staticmethod
+    def _row(task):
+        start, end = task.start, task.end
+        return (
+            task.task_id,
+            task.name,
+            start.isoformat() if start else None,
+            end.isoformat() if end else None,
+            task.group,
+            task.last_edited_time
+        )
+
+    def load_tasks(self):
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT task_id, name, start, end, task_group, last_edited_time FROM tasks ORDER BY position'
+            ).fetchall()
+
+        return [Task.from_iso(task_id, name, start, end, group, last_edited_time)
+                for task_id, name, start, end, group, last_edited_time in rows]
+
+    def save_tasks(self, tasks):
+        # replace everything, e.g. after a full sync
+        rows = [self._row(task) for task in tasks]
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM tasks')
+            self._connection.executemany(
+                'INSERT INTO tasks (task_id, name, start, end, task_group, last_edited_time) VALUES (?, ?, ?, ?, ?, ?)',
+                rows
+            )
+
+    def upsert_task(self, task):
+        with self._lock, self._connection:
+            self._connection.execute(
+                '''INSERT INTO tasks (task_id, name, start, end, task_group, last_edited_time) VALUES (?, ?, ?, ?, ?, ?)
+                   ON CONFLICT(task_id) DO UPDATE SET
+                       name = excluded.name, start = excluded.start, end = excluded.end,
+                       task_group = excluded.task_group,
+                       last_edited_time = COALESCE(excluded.last_edited_time, tasks.last_edited_time)''',
+                self._row(task)
+            )
+
+    def delete_task(self, task_id):
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM tasks WHERE task_id = ?', (task_id,))
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self._connection.execute('SELECT value FROM meta WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, **values):
+        with self._lock, self._connection:
+            self._connection.executemany(
+                'INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value',
+                [(key, None if value is None else str(value)) for key, value in values.items()]
+            )
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
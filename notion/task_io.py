@@ -0,0 +1,291 @@
+import csv
+import hashlib
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from notion import Task
+
+
+formats = ('csv', 'jsonl', 'ics')
+csv_columns = ['id', 'name', 'start', 'end', 'group']
+max_reported_failures = 20      # rows listed in an import summary; the rest are only counted
+
+
+def detect_format(path, format=None):
+    if format is None:
+        extension = os.path.splitext(path)[1].lower().lstrip('.')
+        format = {'json': 'jsonl', 'ndjson': 'jsonl', 'ical': 'ics'}.get(extension, extension)
+    if format not in formats:
+        raise ValueError(f"Unsupported file format '{format}', expected one of {', '.join(formats)}")
+    return format
+
+
+def _fields_to_task(fields):
+    # an id from the file is not kept, Notion assigns a new one
+    return Task(None, fields.get('name') or '', {'start': fields.get('start') or None, 'end': fields.get('end') or None},
+                fields.get('group') or None)
+
+
+def _task_fields(task):
+    start, end = task.start, task.end
+    return {
+        'id': task.task_id,
+        'name': task.name,
+        'start': start.isoformat() if start else '',
+        'end': end.isoformat() if end else '',
+        'group': task.group or ''
+    }
+
+
+# iCalendar
+def _ics_unescape(value):
+    return value.replace('\\n', '\n').replace('\\N', '\n').replace('\\,', ',').replace('\\;', ';').replace('\\\\', '\\')
+
+
+def _ics_escape(value):
+    return value.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+
+def _ics_datetime(parameters, value):
+    if 'VALUE=DATE' in parameters or len(value) == 8:
+        return datetime.strptime(value, '%Y%m%d').isoformat()
+    if value.endswith('Z'):
+        return datetime.strptime(value, '%Y%m%dT%H%M%SZ').replace(tzinfo=timezone.utc).isoformat()
+    return datetime.strptime(value, '%Y%m%dT%H%M%S').isoformat()       # floating or TZID: taken as local time
+
+
+def _unfold(lines):
+    # continuation lines of a long property start with a space or a tab
+    pending = None
+    for line in lines:
+        line = line.rstrip('\r\n')
+        if line[:1] in (' ', '\t') and pending is not None:
+            pending += line[1:]
+            continue
+        if pending is not None:
+            yield pending
+        pending = line
+    if pending is not None:
+        yield pending
+
+
+def _read_ics(f):
+    # the raw properties of every event; they are parsed per row, so a bad one only fails its own row
+    properties = None
+    for line in _unfold(f):
+        if line == 'BEGIN:VEVENT':
+            properties = {}
+        elif line == 'END:VEVENT' and properties is not None:
+            yield properties
+            properties = None
+        elif properties is not None and ':' in line:
+            key, value = line.split(':', 1)
+            name, _, parameters = key.partition(';')
+            properties[name] = (parameters, value)
+
+
+def _parse_ics(properties):
+    fields = {}
+    if 'SUMMARY' in properties:
+        fields['name'] = _ics_unescape(properties['SUMMARY'][1])
+    if 'DTSTART' in properties:
+        fields['start'] = _ics_datetime(*properties['DTSTART'])
+    if 'DTEND' in properties:
+        fields['end'] = _ics_datetime(*properties['DTEND'])
+    if 'CATEGORIES' in properties:
+        fields['group'] = _ics_unescape(properties['CATEGORIES'][1].split(',')[0])
+    return fields
+
+
+def _ics_stamp(moment):
+    return moment.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def _ics_event(task, stamp):
+    lines = ['BEGIN:VEVENT', f'UID:{task.task_id}', f'DTSTAMP:{stamp}', f'SUMMARY:{_ics_escape(task.name or "")}']
+    if task.start:
+        lines.append(f'DTSTART:{_ics_stamp(task.start)}')
+    if task.end:
+        lines.append(f'DTEND:{_ics_stamp(task.end)}')
+    if task.group:
+        lines.append(f'CATEGORIES:{_ics_escape(task.group)}')
+    lines.append('END:VEVENT')
+    return '\r\n'.join(lines) + '\r\n'
+
+
+# reading and writing
+def read_rows(path, format=None):
+    # (row number, raw row) one at a time; see parse_row
+    format = detect_format(path, format)
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        if format == 'csv':
+            rows = csv.DictReader(f)
+        elif format == 'jsonl':
+            rows = (line for line in f if line.strip())
+        else:
+            rows = _read_ics(f)
+        yield from enumerate(rows, start=1)
+
+
+def _parse_json(line):
+    fields = json.loads(line)
+    if not isinstance(fields, dict):
+        raise ValueError(f"expected a JSON object, got {type(fields).__name__}")
+    return fields
+
+
+def parse_row(raw, format):
+    # raises ValueError for a malformed row
+    if format == 'csv':
+        return raw
+    if format == 'jsonl':
+        return _parse_json(raw)
+    return _parse_ics(raw)
+
+
+def write_tasks(tasks, path, format=None):
+    # the file is replaced only once it is fully written
+    format = detect_format(path, format)
+    count = 0
+    try:
+        with open(path + '.tmp', 'w', encoding='utf-8', newline='') as f:
+            if format == 'csv':
+                writer = csv.DictWriter(f, fieldnames=csv_columns)
+                writer.writeheader()
+            elif format == 'ics':
+                f.write('BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:-//NotionPlanner//EN\r\n')
+                stamp = _ics_stamp(datetime.now().astimezone())
+
+            for task in tasks:
+                if format == 'csv':
+                    writer.writerow(_task_fields(task))
+                elif format == 'jsonl':
+                    f.write(json.dumps(_task_fields(task), ensure_ascii=False) + '\n')
+                else:
+                    f.write(_ics_event(task, stamp))
+                count += 1
+
+            if format == 'ics':
+                f.write('END:VCALENDAR\r\n')
+    except BaseException:
+        os.remove(path + '.tmp')
+        raise
+    os.replace(path + '.tmp', path)
+    return count
+
+
+# import and export through a planner
+# the checkpoint is keyed to the file's size and mtime, so a changed file starts over
+class ImportCheckpoint:
+    def __init__(self, path):
+        directory = os.getenv('NOTION_CACHE_DIR', '.notion_cache') or tempfile.gettempdir()
+        name = hashlib.sha256(os.path.abspath(path).encode('utf-8')).hexdigest()[:16]
+        self.path = os.path.join(directory, 'imports', name + '.checkpoint')
+        stat = os.stat(path)
+        self.key = {'size': stat.st_size, 'mtime': stat.st_mtime_ns}
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+            return checkpoint['row'] if checkpoint.get('key') == self.key else 0
+        except (OSError, ValueError, KeyError, AttributeError):
+            return 0
+
+    def save(self, row):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path + '.tmp', 'w', encoding='utf-8') as f:
+            json.dump({'row': row, 'key': self.key}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(self.path + '.tmp', self.path)
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _rate(count, elapsed):
+    return count / elapsed if elapsed > 0 else 0.0
+
+
+def import_tasks(planner, path, format=None, chunk_size=100, progress=print, cancelled=None):
+    # one chunk in memory at a time; rows of an interrupted chunk may be added twice on resume
+    checkpoint = ImportCheckpoint(path)
+    resume_after = checkpoint.load()
+    added, failed, failures = 0, 0, []
+    checkpoint_error = None
+    last_row = resume_after
+    start = time.perf_counter()
+
+    def fail(row, error):
+        nonlocal failed
+        failed += 1
+        if len(failures) < max_reported_failures:
+            failures.append(f"row {row}: {error}")
+
+    def flush(chunk):
+        nonlocal added, checkpoint_error
+        if chunk:
+            result = planner.add_tasks_bulk([task for _, task in chunk])
+            added += len(result.succeeded)
+            for (row, _), item in zip(chunk, result.items):
+                if not item.ok:
+                    fail(row, item.error)
+        if checkpoint_error is None:
+            try:
+                checkpoint.save(last_row)
+            except OSError as e:        # the rows are in Notion already; only resuming is lost
+                checkpoint_error = e
+                progress(f"Could not save the import checkpoint: {e}")
+        progress(f"Imported {last_row - resume_after} rows ({_rate(last_row - resume_after, time.perf_counter() - start):.1f} rows/s)")
+
+    format = detect_format(path, format)
+    chunk = []
+    for row, raw in read_rows(path, format):
+        if row <= resume_after:
+            continue
+        last_row = row
+        try:
+            chunk.append((row, _fields_to_task(parse_row(raw, format))))
+        except (ValueError, TypeError, AttributeError) as e:
+            fail(row, e)
+
+        if (row - resume_after) % chunk_size == 0:
+            flush(chunk)
+            chunk = []
+            if cancelled is not None and cancelled():
+                return f"Import cancelled after row {last_row}; run it again to resume."
+    flush(chunk)
+    if checkpoint_error is None:
+        try:
+            checkpoint.clear()
+        except OSError:
+            pass
+
+    elapsed = time.perf_counter() - start
+    string = f"{added} Tasks imported successfully! ({last_row - resume_after} rows in {elapsed:.2f}s, {_rate(last_row - resume_after, elapsed):.1f} rows/s)"
+    if resume_after:
+        string += f"\nResumed after row {resume_after}."
+    if checkpoint_error is not None:
+        string += f"\nCould not save the import checkpoint, so an interrupted import starts over: {checkpoint_error}"
+    if failed:
+        string += f"\nFailed {failed} rows:\n" + "\n".join(failures)
+        if failed > len(failures):
+            string += f"\n... and {failed - len(failures)} more"
+    return string
+
+
+def export_tasks(planner, path, format=None, group=None, progress=print):
+    planner.wait_until_ready()
+    store = planner.store       # one snapshot for the whole export
+    tasks = store.find_by_group(group) if group is not None else store
+
+    start = time.perf_counter()
+    count = write_tasks(tasks, path, format)
+    elapsed = time.perf_counter() - start
+    progress(f"Exported {count} rows")
+    return f"{count} Tasks exported successfully! ({elapsed:.2f}s, {_rate(count, elapsed):.1f} rows/s)"
@@ -0,0 +1,206 @@
+from bisect import bisect_left, bisect_right, insort
+import copy
+from datetime import datetime
+from itertools import islice
+
+
+def _timestamp(value):
+    return value.timestamp() if isinstance(value, datetime) else value
+
+
+# tasks are replaced, never modified, so copies can share them; change them only through add/update/remove
+class TaskStore:
+    def __init__(self, tasks=()):
+        self._tasks = {}        # task_id -> Task
+        self._by_name = {}      # name -> {task_id: None}, an insertion-ordered set
+        self._by_group = {}     # group -> {task_id: None}
+        self._by_start = []     # sorted (start timestamp, task_id)
+        # longest end - start of any task so far; bounds how early an overlapping task can start
+        self._max_span = 0.0
+        self._rows = {}         # task_id -> str(task), filled on first render
+        self._owned = None      # (is name index, key) of the id sets copied from the source store; None when nothing is shared
+        for task in tasks:
+            self.add(task)
+
+    def copy(self):
+        # O(n); the id sets stay shared until this copy changes them
+        store = TaskStore.__new__(TaskStore)
+        store._tasks = dict(self._tasks)
+        store._by_name = dict(self._by_name)
+        store._by_group = dict(self._by_group)
+        store._by_start = list(self._by_start)
+        store._max_span = self._max_span
+        store._rows = dict(self._rows)
+        store._owned = set()
+        return store
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __iter__(self):
+        return iter(list(self._tasks.values()))
+
+    def __contains__(self, task_id):
+        return task_id in self._tasks
+
+    # index helpers
+    def _writable_ids(self, index, key):
+        # the id set of `key`, copied first when it may still be shared with the source store
+        task_ids = index.get(key)
+        if self._owned is not None:
+            owned_key = (index is self._by_name, key)
+            if owned_key not in self._owned:
+                self._owned.add(owned_key)
+                if task_ids is not None:
+                    task_ids = index[key] = dict(task_ids)
+        return task_ids
+
+    def _index(self, index, key, task_id):
+        task_ids = self._writable_ids(index, key)
+        if task_ids is None:
+            task_ids = index[key] = {}
+        task_ids[task_id] = None
+
+    def _unindex(self, index, key, task_id):
+        task_ids = self._writable_ids(index, key)
+        if task_ids is None:
+            return
+        task_ids.pop(task_id, None)
+        if not task_ids:
+            del index[key]
+
+    def _index_time(self, task):
+        start, end = task.start_timestamp, task.end_timestamp
+        if start is None:
+            return
+        insort(self._by_start, (start, task.task_id))
+        if end is not None:
+            self._max_span = max(self._max_span, end - start)
+
+    def _unindex_time(self, task):
+        start = task.start_timestamp
+        if start is None:
+            return
+        entry = (start, task.task_id)
+        i = bisect_left(self._by_start, entry)
+        if i < len(self._by_start) and self._by_start[i] == entry:
+            del self._by_start[i]
+
+    # mutations
+    def add(self, task):
+        if task.task_id in self._tasks:
+            self.remove(task.task_id)
+        self._rows.pop(task.task_id, None)
+        self._tasks[task.task_id] = task
+        self._index(self._by_name, task.name, task.task_id)
+        self._index(self._by_group, task.group, task.task_id)
+        self._index_time(task)
+
+    def update(self, task_id, task):
+        # stores a copy with the fields of `task`; returns it, or None
+        stored = self._tasks.get(task_id)
+        if stored is None:
+            return None
+
+        self._unindex(self._by_name, stored.name, task_id)
+        self._unindex(self._by_group, stored.group, task_id)
+        self._unindex_time(stored)
+        self._rows.pop(task_id, None)
+        updated = copy.copy(stored)     # readers of an older store may still hold the stored task
+        updated.name = task.name
+        updated.date = task.date
+        updated.group = task.group
+        if task.last_edited_time:
+            updated.last_edited_time = task.last_edited_time
+        self._tasks[task_id] = updated
+        self._index(self._by_name, updated.name, task_id)
+        self._index(self._by_group, updated.group, task_id)
+        self._index_time(updated)
+
+        return updated
+
+    def replace_id(self, old_id, new_id):
+        # returns the moved task, or None
+        task = self.remove(old_id)
+        if task is None:
+            return None
+        task = copy.copy(task)
+        task.task_id = new_id
+        self.add(task)
+        return task
+
+    def remove(self, task_id):
+        task = self._tasks.pop(task_id, None)
+        self._rows.pop(task_id, None)
+        if task is not None:
+            self._unindex(self._by_name, task.name, task_id)
+            self._unindex(self._by_group, task.group, task_id)
+            self._unindex_time(task)
+        return task
+
+    # rendering
+    def row(self, task):
+        row = self._rows.get(task.task_id)
+        if row is None:
+            row = str(task)
+            if self._tasks.get(task.task_id) is task:     # not a task from another store
+                self._rows[task.task_id] = row
+        return row
+
+    def render(self, tasks):
+        return "\n".join(self.row(task) for task in tasks)
+
+    # queries
+    def get(self, task_id):
+        return self._tasks.get(task_id)
+
+    def find_by_name(self, name):
+        return [self._tasks[task_id] for task_id in self._by_name.get(name, ())]
+
+    def first_id_by_name(self, name):
+        return next(iter(self._by_name.get(name, ())), None)
+
+    def find_by_group(self, group):
+        return [self._tasks[task_id] for task_id in self._by_group.get(group, ())]
+
+    def groups(self):
+        return list(self._by_group)
+
+    # time queries, by start date; bounds are datetimes or timestamps
+    def _start_range(self, start, end):
+        lo = 0 if start is None else bisect_left(self._by_start, (_timestamp(start),))
+        # the maximal code point sorts after every task_id with the same start
+        hi = len(self._by_start) if end is None else bisect_right(self._by_start, (_timestamp(end), chr(0x10ffff)))
+        return lo, hi
+
+    def _starting_between(self, start, end):
+        lo, hi = self._start_range(start, end)
+        return [self._tasks[task_id] for _, task_id in self._by_start[lo:hi]]
+
+    def find_after(self, when):
+        return self._starting_between(when, None)
+
+    def find_between(self, start, end):
+        return self._starting_between(start, end)
+
+    def find_overlapping(self, start, end):
+        # a task without an end date counts as an instant at its start
+        start, end = _timestamp(start), _timestamp(end)
+        candidates = self._starting_between(start - self._max_span, end)
+        return [task for task in candidates
+                if (task.end_timestamp if task.end_timestamp is not None else task.start_timestamp) >= start]
+
+    def page(self, limit=None, offset=0, group=None, start=None, end=None):
+        # without a date window the tasks keep their insertion order, otherwise they are ordered by start
+        stop = None if limit is None else offset + limit
+        if start is None and end is None:
+            task_ids = self._tasks if group is None else self._by_group.get(group, {})
+            return [self._tasks[task_id] for task_id in islice(task_ids, offset, stop)], len(task_ids)
+
+        lo, hi = self._start_range(start, end)
+        if group is None:
+            stop = hi if stop is None else min(hi, lo + stop)
+            return [self._tasks[task_id] for _, task_id in self._by_start[lo + offset:stop]], hi - lo
+
+        entries = [entry for entry in self._by_start[lo:hi] if self._tasks[entry[1]].group == group]
+        return [self._tasks[task_id] for _, task_id in entries[offset:stop]], len(entries)
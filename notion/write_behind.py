@@ -0,0 +1,334 @@
+from collections import deque
+from datetime import datetime, timedelta, timezone
+import json
+import os
+import threading
+import uuid
+
+from requests.exceptions import HTTPError
+
+import notion
+from notion import Task, bulk
+
+
+temp_id_prefix = 'local-'
+
+
+# JSON Lines of mutations, acks (with temporary id -> page id) and uncertain marks, fsynced per line
+class MutationJournal:
+    max_id_map = 1000       # temporary ids still resolvable after a compaction
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._entries = {}      # seq -> pending entry
+        self.id_map = {}        # temporary id -> id assigned by Notion
+        self._seq = 0
+        self._replay()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def _replay(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:    # a line torn by a crash
+                    continue
+                if 'seq' in record:
+                    self._entries[record['seq']] = record
+                    self._seq = max(self._seq, record['seq'])
+                if record.get('uncertain') in self._entries:
+                    self._entries[record['uncertain']]['uncertain'] = {'since': record['since'], 'task': record['task']}
+                for seq in record.get('ack', ()):
+                    self._entries.pop(seq, None)
+                self.id_map.update(record.get('id_map', {}))
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def append(self, op, task_id, task=None):
+        with self._lock:
+            self._seq += 1
+            entry = {'seq': self._seq, 'op': op, 'task_id': task_id}
+            if task is not None:
+                start, end = task.start, task.end
+                entry['task'] = {
+                    'name': task.name,
+                    'start': start.isoformat() if start else None,
+                    'end': end.isoformat() if end else None,
+                    'group': task.group
+                }
+            self._write(entry)
+            self._entries[entry['seq']] = entry
+            return entry['seq']
+
+    def ack(self, seqs, id_map=None):
+        with self._lock:
+            record = {'ack': list(seqs)}
+            if id_map:
+                record['id_map'] = id_map
+                self.id_map.update(id_map)
+            self._write(record)
+            for seq in seqs:
+                self._entries.pop(seq, None)
+            if not self._entries:
+                self._compact()
+
+    def mark_uncertain(self, seq, since, task):
+        # the add may have created a page from `since` on, with the fields `task`
+        with self._lock:
+            if seq not in self._entries:
+                return
+            self._write({'uncertain': seq, 'since': since, 'task': task})
+            self._entries[seq]['uncertain'] = {'since': since, 'task': task}
+
+    def settle(self, seq):
+        # no page was created; after a restart the lookup is only repeated
+        with self._lock:
+            if seq in self._entries:
+                self._entries[seq].pop('uncertain', None)
+
+    def _compact(self):
+        id_map = dict(list(self.id_map.items())[-self.max_id_map:])
+        self.id_map = id_map
+        self._file.close()
+        with open(self.path + '.tmp', 'w', encoding='utf-8') as f:
+            if id_map:
+                f.write(json.dumps({'ack': [], 'id_map': id_map}, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(self.path + '.tmp', self.path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+
+    def pending(self):
+        with self._lock:
+            return [dict(entry) for _, entry in sorted(self._entries.items())]
+
+    def resolve(self, task_id):
+        return self.id_map.get(task_id, task_id)
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def coalesce(entries, resolve):
+    # add + edits -> one add, add + delete -> noop, edits -> the last one, edits + delete -> delete
+    operations = {}
+    for entry in entries:
+        task_id = resolve(entry['task_id'])
+        operation = operations.get(task_id)
+        if operation is None:
+            operations[task_id] = {'op': entry['op'], 'task_id': task_id, 'task': entry.get('task'), 'seqs': [entry['seq']],
+                                   'uncertain': entry.get('uncertain')}
+            continue
+
+        operation['seqs'].append(entry['seq'])
+        if operation['op'] in ('delete', 'noop'):
+            continue
+        if entry['op'] == 'delete':
+            operation['op'] = 'noop' if operation['op'] == 'add' else 'delete'
+            operation['task'] = None
+        elif entry['op'] == 'edit':
+            operation['task'] = entry['task']      # an add stays an add, with the latest state
+
+    return list(operations.values())
+
+
+# unlike bulk retries, a flush also keeps rate-limited mutations for a later try
+def _is_retryable(error):
+    if isinstance(error, HTTPError) and error.response is not None and error.response.status_code == 429:
+        return True
+    return bulk.is_transient(error)
+
+
+def _is_uncertain(operation, error):
+    # a rejected (429) add created nothing, but one that timed out or got a 5xx may have created the page
+    return operation['op'] == 'add' and bulk.is_transient(error)
+
+
+def _to_task(task_id, fields):
+    return Task(task_id, fields['name'], {'start': fields['start'], 'end': fields['end']}, fields['group'])
+
+
+# transient failures stay in the journal and are retried; permanent ones are dropped and force a full sync
+class WriteBehind:
+    def __init__(self, planner, path, interval=1.0, max_backoff=60.0, max_dropped=100):
+        self.planner = planner
+        self.journal = MutationJournal(path)
+        self.interval = interval
+        self.max_backoff = max_backoff
+
+        # for the console and the UI: why the pending mutations are not sent yet, and the ones given up on
+        self.last_error = None
+        self.dropped = deque(maxlen=max_dropped)
+
+        # held while a mutation is journaled and applied locally, so a flushed add cannot swap ids in between
+        self.lock = threading.RLock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._flush_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    # recording
+    def record_add(self, task):
+        task_id = temp_id_prefix + str(uuid.uuid4())
+        self.journal.append('add', task_id, task)
+        self._wake.set()
+        return task_id
+
+    def record_edit(self, task_id, task):
+        task_id = self.journal.resolve(task_id)
+        self.journal.append('edit', task_id, task)
+        self._wake.set()
+        return task_id
+
+    def record_delete(self, task_id):
+        task_id = self.journal.resolve(task_id)
+        self.journal.append('delete', task_id)
+        self._wake.set()
+        return task_id
+
+    def resolve(self, task_id):
+        return self.journal.resolve(task_id)
+
+    def take_dropped(self):
+        # each dropped mutation is reported once
+        dropped = []
+        while True:
+            try:
+                dropped.append(self.dropped.popleft())
+            except IndexError:
+                return dropped
+
+    def pending_count(self):
+        return len(self.journal.pending())
+
+    def pending_ids(self):
+        return {operation['task_id'] for operation in coalesce(self.journal.pending(), self.journal.resolve)}
+
+    def reapply(self, store):
+        # freshly loaded tasks do not include the pending mutations yet
+        for operation in coalesce(self.journal.pending(), self.journal.resolve):
+            if operation['op'] in ('add', 'edit'):
+                task = _to_task(operation['task_id'], operation['task'])
+                if operation['op'] == 'add' or store.get(task.task_id) is None:
+                    store.add(task)
+                else:
+                    store.update(task.task_id, task)
+            elif operation['op'] == 'delete':
+                store.remove(operation['task_id'])
+
+    # flushing
+    def _run(self):
+        backoff = self.interval
+        while not self._stop.is_set():
+            self._wake.wait(backoff)
+            self._wake.clear()
+            try:
+                retry = self.flush()
+            except Exception as e:
+                print(f"Failed to flush the mutation journal: {e}")
+                self.last_error = e
+                retry = True
+            backoff = min(self.max_backoff, backoff * 2) if retry else self.interval
+
+    def flush(self):
+        # True when some mutations are left for a retry
+        with self._flush_lock:
+            operations = coalesce(self.journal.pending(), self.journal.resolve)
+            if not operations:
+                self.last_error = None
+                return False
+            self.planner.wait_until_ready()
+            if any(operation['uncertain'] for operation in operations):
+                self._reconcile(operations)
+                operations = coalesce(self.journal.pending(), self.journal.resolve)
+                if not operations:
+                    self.last_error = None
+                    return False
+
+            # a page created by a failed add has a created_time from about now on
+            since = (datetime.now(timezone.utc) - timedelta(minutes=1)).isoformat()
+            result = bulk.run_bulk('flushed', self._send, operations, [operation['task_id'] for operation in operations], retries=0)
+
+            retry_error = None      # the first failure left in the journal
+            # the local id swaps and removals of the whole flush are one write of the planner's store
+            with self.lock, self.planner._write():
+                for item, operation in zip(result.items, operations):
+                    if item.ok:
+                        self._on_sent(operation, item.task_id)
+                    elif _is_retryable(item.error):
+                        retry_error = retry_error or item.error     # stays in the journal
+                        if _is_uncertain(operation, item.error):
+                            self.journal.mark_uncertain(operation['seqs'][0], since, operation['task'])
+                            self.planner.drift_detected = True      # the next sync loads the page if it exists
+                    else:
+                        message = f"Dropped {operation['op']} of Task[{operation['task_id']}]: {item.error}"
+                        print(message)
+                        self.dropped.append(message)
+                        self.journal.ack(operation['seqs'])
+                        self.planner.drift_detected = True      # the next sync restores the remote state
+                        if operation['op'] == 'add':
+                            self.planner._delete_task_from_local(operation['task_id'])
+            self.last_error = retry_error
+            return retry_error is not None
+
+    def _reconcile(self, operations):
+        # an uncertain add takes over the page it created, if any, and is otherwise sent again;
+        # the edits and a delete folded into it stay in the journal and go to that page
+        for operation in operations:
+            uncertain = operation['uncertain']
+            if not uncertain:
+                continue
+            seq, temp_id = operation['seqs'][0], operation['task_id']
+            own_ids = set(self.journal.id_map.values())     # pages of other adds with the same fields
+            found = [task_id for task_id in notion.notion_api.find_created_task_ids(
+                         _to_task(None, uncertain['task']), uncertain['since'], client=self.planner.client)
+                     if task_id not in own_ids]
+            if not found:
+                self.journal.settle(seq)
+                continue
+            with self.lock, self.planner._write():
+                self.journal.ack([seq], {temp_id: found[0]})
+                self.planner._replace_task_id(temp_id, found[0])
+
+    def _send(self, operation):
+        op, task_id = operation['op'], operation['task_id']
+        if op == 'add':
+            return notion.add_task_to_remote(_to_task(None, operation['task']), client=self.planner.client)
+        if op == 'edit':
+            notion.edit_task_from_remote(task_id, _to_task(task_id, operation['task']), client=self.planner.client)
+        elif op == 'delete':
+            notion.delete_task_from_remote(task_id, client=self.planner.client)
+        return task_id
+
+    def _on_sent(self, operation, task_id):
+        if operation['op'] != 'add':
+            self.journal.ack(operation['seqs'])
+            return
+
+        temp_id = operation['task_id']
+        with self.lock:
+            self.journal.ack(operation['seqs'], {temp_id: task_id})
+            self.planner._replace_task_id(temp_id, task_id)
+
+    def stop(self, flush=True):
+        self._stop.set()
+        self._wake.set()
+        self._thread.join()
+        if flush:
+            try:
+                self.flush()
+            except Exception as e:      # what is left stays in the journal for the next start
+                print(f"Failed to flush the mutation journal: {e}")
+        self.journal.close()
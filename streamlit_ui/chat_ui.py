@@ -1,12 +1,57 @@
+import queue
+
 import streamlit as st
 from langchain_core.messages import HumanMessage
 
 
+class TaskChangeQueue(queue.Queue):
+    # one per session; the watcher holds `offer` weakly, so the subscription ends with the session state
+    def __init__(self, maxsize=100):
+        super().__init__(maxsize)
+
+    def offer(self, diff):
+        try:
+            self.put_nowait(diff)
+        except queue.Full:      # the page has not rerun for a while; the toast is only a summary anyway
+            pass
+
+
+def render_task_changes(changes):
+    added, updated, removed = 0, 0, 0
+    while not changes.empty():
+        diff = changes.get()
+        added += len(diff['added'])
+        updated += len(diff['updated'])
+        removed += len(diff['removed'])
+
+    if added or updated or removed:
+        st.toast(f"Tasks changed in Notion: {added} added, {updated} updated, {removed} removed.")
+
+
 def render_chat_interface():
     st.title("Chat Interface")
 
     if "command_manager" not in st.session_state:
         print("Error: CommandManager not found in session state.")
+    else:
+        # the planner loads its tasks in the background, commands wait for it only when they need the data
+        planner = st.session_state.command_manager.command_handler.planner
+        planner_status = planner.status
+        if planner_status == 'loading':
+            st.info("Loading tasks from Notion...")
+        elif planner_status == 'failed':
+            st.warning("Failed to load tasks from Notion. They will be loaded again on the next command.")
+
+        # changes the write-behind flusher could not write to Notion
+        for message in planner.write_errors():
+            st.warning(message)
+
+        # the planner's watcher (NOTION_WATCH=1) keeps the tasks up to date; report what changed since the last rerun
+        if planner.watch_changes:
+            if "task_changes" not in st.session_state:
+                st.session_state.task_changes = TaskChangeQueue()
+                planner.subscribe(st.session_state.task_changes.offer, weak=True)
+            render_task_changes(st.session_state.task_changes)
 
     if "messages" not in st.session_state:
         st.session_state.messages = []